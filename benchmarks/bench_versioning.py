@@ -0,0 +1,58 @@
+"""
+End-to-end timings of the user-facing operations against a synthetic repository.
+
+    make bench
+    VUTIL_BENCH_SCALE=100k VUTIL_BENCH_DIR=~/.cache/vutil-bench make bench
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from versioning_tool.core import git_session
+
+
+def _in_session(fn, *args):
+    # Every CLI command runs inside one git session; measure the same way
+    def run():
+        with git_session():
+            return fn(*args)
+
+    return run
+
+
+def bench_compute_decision(benchmark, cfg):
+    from versioning_tool.version_manager import compute_decision
+
+    suggested, _, bump = benchmark(_in_session(compute_decision, cfg, "main", "HEAD"))
+    assert bump != "none"
+
+
+def bench_write_changelog(benchmark, cfg, synthetic_repo):
+    from versioning_tool.changelog import write_changelog
+
+    changelog = synthetic_repo / "CHANGELOG.md"
+
+    def fresh():
+        # write_changelog prepends to an existing file; start every round from none
+        changelog.unlink(missing_ok=True)
+
+    benchmark.pedantic(
+        _in_session(write_changelog, "999.0.0", cfg, synthetic_repo), setup=fresh, rounds=10
+    )
+    assert changelog.read_text(encoding="utf-8").count("999.0.0") == 1
+
+
+def bench_generate_release_notes(benchmark, cfg, synthetic_repo):
+    from versioning_tool.changelog import generate_release_notes
+
+    notes = benchmark(_in_session(generate_release_notes, "999.0.0", cfg, synthetic_repo))
+    assert "999.0.0" in notes
+
+
+@pytest.mark.parametrize("graph_type", ["simple", "branch", "commit"])
+def bench_graph_for_main(benchmark, cfg, graph_type):
+    from versioning_tool.graph import graph_for_main
+
+    graph = benchmark(_in_session(graph_for_main, "main", 12, graph_type))
+    assert graph.startswith("```mermaid")
@@ -0,0 +1,72 @@
+"""
+Fixtures for the pytest-benchmark suite.
+
+``VUTIL_BENCH_SCALE`` picks a ``synthrepo`` preset (default ``1k``);
+``VUTIL_BENCH_DIR`` keeps the generated repositories between runs, since the
+larger presets take minutes to build. The commit cache is disabled unless
+``VUTIL_BENCH_CACHE=1`` so every round measures a cold history walk.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+from pathlib import Path
+
+import pytest
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJ_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(PROJ_ROOT))
+sys.path.insert(0, str(BENCH_DIR))
+
+import synthrepo  # noqa: E402
+
+
+def _repo_for(scale: str) -> Path:
+    root = Path(os.getenv("VUTIL_BENCH_DIR") or Path(tempfile.gettempdir()) / "vutil-bench")
+    dest = root / f"synth-{scale}"
+    params = dict(synthrepo.PRESETS[scale], seed=0)
+    marker = dest / ".git" / synthrepo.MARKER
+    if marker.exists() and json.loads(marker.read_text(encoding="utf-8")) == params:
+        return dest
+    shutil.rmtree(dest, ignore_errors=True)
+    return synthrepo.generate(dest, **params)
+
+
+@pytest.fixture(scope="session")
+def synthetic_repo():
+    """The preset repository, with the working directory switched into it."""
+    scale = os.getenv("VUTIL_BENCH_SCALE", "1k")
+    if scale not in synthrepo.PRESETS:
+        raise pytest.UsageError(f"VUTIL_BENCH_SCALE must be one of {sorted(synthrepo.PRESETS)}")
+    repo = _repo_for(scale)
+    shutil.copy(PROJ_ROOT / "CHANGELOG.md.j2", repo / "CHANGELOG.md.j2")
+
+    env = {"VUTIL_NO_DAEMON": "1"}
+    if not os.getenv("VUTIL_BENCH_CACHE"):
+        env["VUTIL_NO_CACHE"] = "1"
+    saved = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    cwd = os.getcwd()
+    os.chdir(repo)
+    try:
+        yield repo
+    finally:
+        os.chdir(cwd)
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+@pytest.fixture(scope="session")
+def cfg(synthetic_repo):
+    from versioning_tool.version_manager import load_cfg
+
+    return load_cfg(PROJ_ROOT / "versioning.yaml")
@@ -0,0 +1,97 @@
+"""
+Compare ``core.filter_files`` against the original per-path ``fnmatch`` loop.
+
+    python benchmarks/filter_files.py --paths 50000 --patterns 200
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import random
+import fnmatch
+import argparse
+
+from pathlib import Path
+from typing import Iterable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from versioning_tool.core import FileMatcher, filter_files  # noqa: E402
+
+DIRS = ["src", "docs", "tests", "pkg", "vendor", "assets", ".github", "build", "api", "web"]
+EXTS = ["py", "md", "txt", "json", "yaml", "js", "ts", "css", "png", "cfg"]
+
+
+def fnmatch_filter(paths: Iterable[str], patterns: Iterable[str]) -> List[str]:
+    """The implementation filter_files replaced: O(paths x patterns) fnmatch calls."""
+    keep = []
+    for p in paths:
+        if any(fnmatch.fnmatch(p, pat) for pat in patterns):
+            continue
+        keep.append(p)
+    return keep
+
+
+def make_paths(n: int, rng: random.Random) -> List[str]:
+    paths = []
+    for i in range(n):
+        depth = rng.randint(1, 5)
+        parts = [rng.choice(DIRS) for _ in range(depth)]
+        paths.append("/".join(parts) + f"/file{i}.{rng.choice(EXTS)}")
+    return paths
+
+
+def make_patterns(n: int, rng: random.Random) -> List[str]:
+    # A realistic mix: extensions, directory trees, literal files and a few free-form globs
+    shapes = [
+        lambda: f"*.{rng.choice(EXTS)}{rng.randint(0, 99)}",
+        lambda: f"{rng.choice(DIRS)}/{rng.choice(DIRS)}{rng.randint(0, 99)}/**",
+        lambda: f"{rng.choice(DIRS)}/file{rng.randint(0, 10**6)}.txt",
+        lambda: f"{rng.choice(DIRS)}/*/gen_{rng.randint(0, 99)}_*.py",
+        lambda: f"**/{rng.choice(DIRS)}{rng.randint(0, 99)}/*.lock",
+    ]
+    base = ["*.md", "docs/**", ".github/**"]
+    return base + [rng.choice(shapes)() for _ in range(max(0, n - len(base)))]
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--paths", type=int, default=50_000)
+    p.add_argument("--patterns", type=int, default=200)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    rng = random.Random(args.seed)
+    paths = make_paths(args.paths, rng)
+    patterns = make_patterns(args.patterns, rng)
+
+    # Patterns without "**/" must keep their fnmatch behaviour
+    legacy = [pat for pat in patterns if "**/" not in pat]
+    if filter_files(paths, legacy) != fnmatch_filter(paths, legacy):
+        print("FAIL: results differ from fnmatch")
+        return 1
+
+    compile_s = best_of(lambda: FileMatcher(patterns), args.repeat)
+    new_s = best_of(lambda: filter_files(paths, patterns), args.repeat)
+    old_s = best_of(lambda: fnmatch_filter(paths, patterns), 1)
+
+    print(f"{args.paths} paths x {len(patterns)} patterns")
+    print(f"  fnmatch loop : {old_s * 1000:10.1f} ms")
+    print(f"  filter_files : {new_s * 1000:10.1f} ms  (compile {compile_s * 1000:.2f} ms)")
+    print(f"  speedup      : {old_s / new_s:10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Check ``objects.NativeBackend`` against git on loose, packed and split-graph repositories.
+
+    python benchmarks/native_backend.py --commits 2000
+
+Builds a synthetic repository (see ``synthrepo.py``), adds a merge and commits
+that move files on top, and makes copies of it whose objects are loose, packed with
+OFS_DELTA or REF_DELTA entries, and covered by a split commit-graph chain plus
+loose commits on top. Every backend query is answered by both the subprocess
+session and the native reader; any difference is printed and fails the run.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from synthrepo import generate  # noqa: E402
+
+from versioning_tool import core, reachability  # noqa: E402
+from versioning_tool.objects import NativeBackend  # noqa: E402
+
+IDENT = {
+    "GIT_AUTHOR_NAME": "Bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_AUTHOR_DATE": "1700000000 +0000",
+    "GIT_COMMITTER_NAME": "Bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_DATE": "1700000000 +0000",
+}
+
+
+def git(repo: Path, *args: str, env: Optional[Dict[str, str]] = None, **kw) -> str:
+    out = subprocess.run(
+        ["git", "-C", str(repo), *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, **IDENT, **(env or {})},
+        **kw,
+    )
+    return out.stdout.strip()
+
+
+def _copy(src: Path, dest: Path) -> Path:
+    shutil.copytree(src, dest, symlinks=True)
+    return dest
+
+
+def _extend(repo: Path) -> Path:
+    """
+    Commits on main the generator does not make: a merge of another branch, then
+    two commits moving files without edits, one within a directory, one across.
+    """
+    heads = git(repo, "for-each-ref", "--format=%(refname:short)", "refs/heads").split()
+    other = next(h for h in heads if h != "main")
+    merge = git(repo, "commit-tree", "main^{tree}", "-p", "main", "-p", other, "-m", "Merge")
+    git(repo, "update-ref", "refs/heads/main", merge)
+    index = {"GIT_INDEX_FILE": str(repo / ".git" / "rename-index")}
+    blobs = git(repo, "ls-tree", "-r", "main").splitlines()[:4]
+    for step, moves in enumerate((blobs[:2], blobs[2:])):
+        git(repo, "read-tree", "main", env=index)
+        lines = []
+        for entry in moves:
+            meta, path = entry.split("\t", 1)
+            mode, _, sha = meta.split()
+            dest = f"moved/{path}" if step else path.replace(".", "_renamed.", 1)
+            lines += [f"0 {'0' * 40}\t{path}", f"{mode} {sha}\t{dest}"]
+        git(repo, "update-index", "--index-info", input="\n".join(lines) + "\n", env=index)
+        tree = git(repo, "write-tree", env=index)
+        sha = git(repo, "commit-tree", tree, "-p", "main", "-m", f"refactor: move files {step}")
+        git(repo, "update-ref", "refs/heads/main", sha)
+    (repo / ".git" / "rename-index").unlink()
+    git(repo, "repack", "-adq")  # _loose copies objects out of packs only
+    return repo
+
+
+def _loose(src: Path, dest: Path) -> Path:
+    """Same refs as ``src``, every object loose."""
+    git(dest.parent, "init", "-q", dest.name)
+    for pack in sorted((src / ".git" / "objects" / "pack").glob("*.pack")):
+        with open(pack, "rb") as f:
+            git(dest, "unpack-objects", "-q", stdin=f)
+    refs = git(src, "for-each-ref", "--format=create %(refname) %(objectname)")
+    git(dest, "update-ref", "--stdin", input=refs + "\n")
+    git(dest, "symbolic-ref", "HEAD", "refs/heads/main")
+    return dest
+
+
+def _split_graph(src: Path, dest: Path) -> Path:
+    """A two-layer commit-graph chain, plus a few loose commits no layer covers."""
+    _copy(src, dest)
+    for stale in (dest / ".git" / "objects" / "info").glob("commit-graph*"):
+        if stale.is_file():
+            stale.unlink()
+    git(dest, "commit-graph", "write", "--split", "--reachable")
+    for i in range(3):
+        tree = git(dest, "rev-parse", "main^{tree}")
+        sha = git(dest, "commit-tree", tree, "-p", "main", "-m", f"fix: loose {i}")
+        git(dest, "update-ref", "refs/heads/main", sha)
+    git(dest, "commit-graph", "write", "--split=no-merge", "--reachable")
+    for i in range(2):  # newer than every layer
+        tree = git(dest, "rev-parse", "main^{tree}")
+        sha = git(dest, "commit-tree", tree, "-p", "main", "-m", f"feat: newest {i}")
+        git(dest, "update-ref", "refs/heads/main", sha)
+    chain = dest / ".git" / "objects" / "info" / "commit-graphs" / "commit-graph-chain"
+    assert len(chain.read_text().split()) >= 2, "expected a split commit-graph chain"
+    return dest
+
+
+def build(root: Path, commits: int, seed: int) -> Dict[str, Path]:
+    base = generate(
+        root / "base",
+        commits=commits,
+        tags=max(1, commits // 50),
+        branches=max(2, commits // 100),
+        files=max(10, commits // 4),
+        seed=seed,
+        commit_graph=False,
+    )
+    _extend(base)
+    repos = {"loose": _loose(base, root / "loose")}
+
+    ofs = _copy(base, root / "ofs-delta")
+    git(ofs, "repack", "-adfq", "--depth=50", "--window=50")
+    git(ofs, "commit-graph", "write", "--reachable")
+    repos["ofs-delta"] = ofs
+
+    ref = _copy(base, root / "ref-delta")
+    git(ref, "-c", "repack.useDeltaBaseOffset=false", "repack", "-adfq", "--depth=50")
+    repos["ref-delta"] = ref
+
+    repos["split-graph"] = _split_graph(ofs, root / "split-graph")
+    return repos
+
+
+def queries(session: core.GitSession, rng: random.Random) -> Dict[str, Callable]:
+    """Name -> fn(backend) for every backend query worth comparing."""
+    tags = [t.name for t in session.list_tags()]
+    heads = [b.name for b in session.list_branches()]
+    shas = session.run(["rev-list", "--all"]).split()
+    revs = heads + tags + [f"{t}^{{}}" for t in tags[:20]]
+    revs += ["HEAD", "HEAD~1", "HEAD~7", "main^1", "origin/main", "no-such-ref"]
+    revs += rng.sample(shas, min(50, len(shas)))
+    # suffix chains, abbreviated SHAs, reflog entries and specs git rejects
+    merges = session.run(["rev-list", "--merges", "--max-count=5", "--all"]).split()
+    for m in merges:
+        revs += [f"{m}^2", f"{m[:9]}^2~1", f"{m}~1^2", f"{m}^{{}}^2^{{tree}}", f"{m}^0"]
+    revs += ["HEAD~1^2", "HEAD~2^2~1", "main^^", "HEAD~0", "HEAD^{tree}", "main~3^{tree}"]
+    revs += ["@", "@~2", "HEAD^{object}", f"{tags[0]}^{{tag}}" if tags else "HEAD^{tag}"]
+    revs += [sha[:7] for sha in rng.sample(shas, min(20, len(shas)))] + ["0000", "zzzzzzz"]
+    reflog = Path(".git", "logs", "refs", "heads", "main")
+    entries = len(reflog.read_text().splitlines()) if reflog.exists() else 0
+    revs += [f"main@{{{i}}}" for i in range(min(entries, 3))] + ["HEAD@{0}"] * bool(entries)
+    revs += ["HEAD~x", "HEAD^{bogus}", "HEAD^-", "HEAD^{tree}~1", "main~1^{blob}"]
+
+    checks: Dict[str, Callable] = {
+        "current_branch": lambda b: b.current_branch(),
+        "list_tags": lambda b: b.list_tags(),
+        "list_tags(creatordate)": lambda b: b.list_tags(sort="creatordate"),
+        "list_tags(merged=main)": lambda b: b.list_tags(merged="main"),
+        "list_branches": lambda b: b.list_branches(),
+    }
+    for rev in revs:
+        checks[f"resolve {rev}"] = lambda b, r=rev: b.resolve(r)
+        checks[f"commit_sha {rev}"] = lambda b, r=rev: b.commit_sha(r)
+        checks[f"commit_message {rev}"] = lambda b, r=rev: b.commit_message(r)
+        checks[f"commit_parents {rev}"] = lambda b, r=rev: b.commit_parents(r)
+    for _ in range(50):
+        a, c = rng.sample(shas, 2)
+        checks[f"changed_files {a[:8]} {c[:8]}"] = lambda b, x=a, y=c: b.changed_files(x, y)
+    for a, c in (("main~1", "main"), ("main~2", "main~1"), ("main~2", "main"), ("main", "main~2")):
+        checks[f"changed_files {a} {c}"] = lambda b, x=a, y=c: b.changed_files(x, y)
+    return checks
+
+
+def compare(repo: Path, rng: random.Random) -> List[str]:
+    os.chdir(repo)
+    failures = []
+    with core.git_session() as session:
+        native = NativeBackend()
+        core.set_backend(native)  # merged= filtering walks the native commit-graph
+        reachability._index = None
+        try:
+            for name, fn in queries(session, rng).items():
+                expected = fn(session)
+                try:
+                    got = fn(native)
+                except Exception as e:  # a crash is a difference too
+                    got = f"raised {e!r}"
+                if expected != got:
+                    failures.append(f"{name}: git={expected!r:.200} native={got!r:.200}")
+        finally:
+            core.set_backend(None)
+            reachability._index = None
+    return failures
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--commits", type=int, default=2_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--keep", type=Path, help="Build the repositories here and keep them")
+    args = p.parse_args()
+
+    root = args.keep or Path(tempfile.mkdtemp(prefix="vutil-native-"))
+    cwd = os.getcwd()
+    try:
+        start = time.perf_counter()
+        repos = build(root, args.commits, args.seed)
+        print(f"built {len(repos)} repositories in {time.perf_counter() - start:.1f}s")
+        failed = 0
+        for name, repo in repos.items():
+            failures = compare(repo, random.Random(args.seed))
+            failed += len(failures)
+            print(f"  {name:<12} {'ok' if not failures else f'{len(failures)} differences'}")
+            for line in failures[:20]:
+                print(f"    {line}")
+    finally:
+        os.chdir(cwd)
+        if args.keep is None:
+            shutil.rmtree(root, ignore_errors=True)
+    if failed:
+        print("FAIL: native backend differs from git")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
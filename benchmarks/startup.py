@@ -0,0 +1,74 @@
+"""
+Cold-start budget for the `vutil` CLI.
+
+Runs ``python -X importtime -c "import versioning_tool.version_manager"`` in fresh
+interpreters, reports the best cumulative import time of the CLI module and fails
+when it exceeds the budget or when a heavy dependency is imported eagerly.
+
+    python benchmarks/startup.py --budget-ms 80
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import argparse
+import subprocess
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+TARGET = "versioning_tool.version_manager"
+
+# Only the subcommands that need these may import them
+LAZY_MODULES = ["yaml", "jinja2", "packaging", "versioning_tool.changelog", "versioning_tool.graph"]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_times(module: str = TARGET) -> Dict[str, Tuple[int, int]]:
+    """Return ``{module: (self_us, cumulative_us)}`` for one fresh interpreter."""
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    times = {}
+    for line in res.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            times[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    return times
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--budget-ms", type=float, default=80.0, help="Cumulative import budget")
+    p.add_argument("--runs", type=int, default=5, help="Fresh interpreters to sample")
+    p.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = p.parse_args()
+
+    samples = [import_times() for _ in range(args.runs)]
+    best = min(samples, key=lambda t: t[TARGET][1])
+    total_ms = best[TARGET][1] / 1000
+
+    print(f"{TARGET}: {total_ms:.1f} ms (best of {args.runs}, budget {args.budget_ms:.1f} ms)")
+    for name, (_, cumulative) in sorted(best.items(), key=lambda kv: -kv[1][1])[1 : args.top + 1]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = [m for m in LAZY_MODULES if m in best]
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: startup budget exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Build a deterministic synthetic git repository with ``git fast-import``.
+
+    python benchmarks/synthrepo.py /tmp/synth-1k --preset 1k
+    python benchmarks/synthrepo.py /tmp/synth --commits 20000 --tags 500 --branches 300
+
+The same arguments always produce the same commit SHAs: authors, messages, file
+changes and timestamps all derive from ``--seed``. ``main`` carries conventional
+commit messages and annotated semver tags; ``origin/main`` points at the last tag
+so that ``vutil check`` sees the commits since the last release. Half of the
+feature branches sit on ``main`` history (merged), the other half carry one
+commit of their own.
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import time
+import random
+import argparse
+import subprocess
+
+from pathlib import Path
+from typing import IO, Dict, Optional
+
+PRESETS: Dict[str, Dict[str, int]] = {
+    "1k": {"commits": 1_000, "tags": 100, "branches": 50, "files": 500},
+    "100k": {"commits": 100_000, "tags": 10_000, "branches": 5_000, "files": 20_000},
+    "1m": {"commits": 1_000_000, "tags": 10_000, "branches": 5_000, "files": 50_000},
+}
+
+MARKER = ".synthrepo.json"  # parameters of the generated repo, for reuse checks
+EPOCH = 1_600_000_000
+AUTHORS = [f"Dev {i:02d} <dev{i:02d}@example.com>" for i in range(20)]
+TYPES = ["feat", "fix", "docs", "chore", "refactor", "perf", "test", "ci"]
+WEIGHTS = [25, 30, 10, 15, 8, 5, 5, 2]
+SCOPES = ["api", "cli", "core", "docs", "build", None, None, None]
+AREAS = ["src", "src", "src", "docs", "tests", "assets"]
+
+
+def _data(out: IO[bytes], text: str):
+    raw = text.encode()
+    out.write(b"data %d\n" % len(raw) + raw + b"\n")
+
+
+def _path(i: int) -> str:
+    area = AREAS[i % len(AREAS)]
+    ext = {"docs": "md", "assets": "json"}.get(area, "py")
+    return f"{area}/pkg{i % 97:02d}/mod{i // 97:03d}/file{i}.{ext}"
+
+
+def _message(rng: random.Random, i: int) -> tuple[str, Optional[str]]:
+    """Return (message, bump) for commit ``i``."""
+    kind = rng.choices(TYPES, WEIGHTS)[0]
+    scope = rng.choice(SCOPES)
+    head = f"{kind}({scope})" if scope else kind
+    breaking = rng.random() < 0.01
+    subject = f"{head}{'!' if breaking and i % 2 else ''}: change {i}"
+    if rng.random() < 0.2:
+        subject += f" (#{1000 + i})"
+    body = "\n\nBREAKING CHANGE: reworked interface" if breaking and not i % 2 else ""
+    bump = "major" if breaking else "minor" if kind == "feat" else "patch"
+    return subject + body + "\n", bump
+
+
+def _commit(out: IO[bytes], ref: str, mark: int, ts: int, author: str, msg: str, parent=None):
+    out.write(f"commit {ref}\nmark :{mark}\n".encode())
+    out.write(f"author {author} {ts} +0000\ncommitter {author} {ts} +0000\n".encode())
+    _data(out, msg)
+    if parent is not None:
+        out.write(f"from :{parent}\n".encode())
+
+
+def _bump(version: list, level: str):
+    if level == "major":
+        version[:] = [version[0] + 1, 0, 0]
+    elif level == "minor":
+        version[:] = [version[0], version[1] + 1, 0]
+    else:
+        version[2] += 1
+
+
+def generate(
+    dest: Path,
+    commits: int,
+    tags: int,
+    branches: int,
+    files: int,
+    seed: int = 0,
+    commit_graph: bool = True,
+) -> Path:
+    """Create the repository at ``dest`` (which must not exist yet) and return it."""
+    rng = random.Random(seed)
+    dest.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(dest)], check=True)
+    proc = subprocess.Popen(
+        ["git", "fast-import", "--quiet", "--done"], cwd=dest, stdin=subprocess.PIPE
+    )
+    out = proc.stdin
+
+    # Root commit: the whole (wide) tree at once
+    _commit(out, "refs/heads/main", 1, EPOCH, AUTHORS[0], "chore: initial import\n")
+    out.write(b"M 100644 inline pyproject.toml\n")
+    _data(out, '[project]\nname = "synthetic"\nversion = "0.0.0"\n')
+    for f in range(files):
+        out.write(f"M 100644 inline {_path(f)}\n".encode())
+        _data(out, f"# {f}\n")
+
+    every = max(1, commits // (tags + 1))  # leaves an untagged tail after the last release
+    version, pending, tagged, last_tag_mark = [0, 0, 0], "patch", 0, 1
+    levels = {"patch": 0, "minor": 1, "major": 2}
+    for i in range(2, commits + 1):
+        msg, bump = _message(rng, i)
+        if levels[bump] > levels[pending]:
+            pending = bump
+        _commit(out, "refs/heads/main", i, EPOCH + i * 600, rng.choice(AUTHORS), msg, i - 1)
+        for _ in range(rng.randint(1, 3)):
+            out.write(f"M 100644 inline {_path(rng.randrange(max(1, files)))}\n".encode())
+            _data(out, f"# {i}\n")
+        if i % every == 0 and tagged < tags:
+            _bump(version, pending)
+            name = "v{}.{}.{}".format(*version)
+            out.write(f"tag {name}\nfrom :{i}\n".encode())
+            out.write(f"tagger {AUTHORS[0]} {EPOCH + i * 600 + 1} +0000\n".encode())
+            _data(out, f"Release {name}\n")
+            pending, tagged, last_tag_mark = "patch", tagged + 1, i
+
+    out.write(f"reset refs/remotes/origin/main\nfrom :{last_tag_mark}\n".encode())
+
+    mark = commits + 1
+    for b in range(branches):
+        ref = f"refs/heads/feature/{b:05d}"
+        base = rng.randint(1, commits)
+        if b % 2:
+            out.write(f"reset {ref}\nfrom :{base}\n".encode())
+            continue
+        msg, _ = _message(rng, mark)
+        _commit(out, ref, mark, EPOCH + base * 600 + 300, rng.choice(AUTHORS), msg, base)
+        out.write(f"M 100644 inline feature/{b:05d}.txt\n".encode())
+        _data(out, f"{b}\n")
+        mark += 1
+
+    out.write(b"done\n")
+    out.close()
+    if proc.wait():
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+    subprocess.run(["git", "-C", str(dest), "symbolic-ref", "HEAD", "refs/heads/main"], check=True)
+    if commit_graph:
+        subprocess.run(["git", "-C", str(dest), "commit-graph", "write", "--reachable"], check=True)
+    params = dict(commits=commits, tags=tags, branches=branches, files=files, seed=seed)
+    (dest / ".git" / MARKER).write_text(json.dumps(params), encoding="utf-8")
+    return dest
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("dest", type=Path)
+    p.add_argument("--preset", choices=sorted(PRESETS), default="1k")
+    p.add_argument("--commits", type=int)
+    p.add_argument("--tags", type=int)
+    p.add_argument("--branches", type=int)
+    p.add_argument("--files", type=int, help="Files in the initial tree")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--no-commit-graph", action="store_true")
+    args = p.parse_args()
+
+    params = dict(PRESETS[args.preset])
+    for key in params:
+        if getattr(args, key) is not None:
+            params[key] = getattr(args, key)
+
+    start = time.perf_counter()
+    generate(args.dest, seed=args.seed, commit_graph=not args.no_commit_graph, **params)
+    print(f"{args.dest}: {params} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Compare ``semver`` tag sorting and ``next_version`` against ``packaging.Version``.
+
+    python benchmarks/versions.py --tags 10000
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import random
+import argparse
+
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from packaging.version import Version  # noqa: E402
+
+from versioning_tool.rules import BumpDecision, next_version  # noqa: E402
+from versioning_tool.semver import _parse, sort_versions  # noqa: E402
+
+LABELS = ["alpha", "beta", "rc"]
+
+
+def make_tags(n: int, rng: random.Random) -> List[str]:
+    tags = set()
+    while len(tags) < n:
+        v = f"v{rng.randint(0, 30)}.{rng.randint(0, 50)}.{rng.randint(0, 50)}"
+        if rng.random() < 0.3:
+            v += f"-{rng.choice(LABELS)}.{rng.randint(1, 9)}"
+        tags.add(v)
+    return sorted(tags)  # lexical, like `git tag`
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--tags", type=int, default=10_000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    tags = make_tags(args.tags, random.Random(args.seed))
+    by_packaging = sorted(tags, key=lambda t: Version(t))
+    if sort_versions(tags) != by_packaging:
+        print("FAIL: order differs from packaging")
+        return 1
+
+    def cold_sort():
+        _parse.cache_clear()
+        sort_versions(tags)
+
+    decision = BumpDecision(bump="minor", prerelease=None, reason="")
+    old_sort = best_of(lambda: sorted(tags, key=lambda t: Version(t)), args.repeat)
+    new_cold = best_of(cold_sort, args.repeat)
+    new_warm = best_of(lambda: sort_versions(tags), args.repeat)
+    bumps = best_of(lambda: [next_version(t, decision) for t in tags], args.repeat)
+
+    print(f"sort {len(tags)} tags")
+    print(f"  packaging.Version : {old_sort * 1000:8.1f} ms")
+    print(f"  semver (cold)     : {new_cold * 1000:8.1f} ms")
+    print(f"  semver (memoized) : {new_warm * 1000:8.1f} ms")
+    print(f"next_version x {len(tags)} : {bumps * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Fixtures for the unit tests: a small scratch repository and a clean slate of the
+process-wide git session, backend, reachability index and commit cache.
+"""
+
+from __future__ import annotations
+
+import sys
+import subprocess
+
+from pathlib import Path
+
+import pytest
+
+PROJ_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJ_ROOT))
+
+from versioning_tool import cache, core, reachability  # noqa: E402
+
+
+def git(repo: Path, *args: str) -> str:
+    res = subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True, check=True)
+    return res.stdout.strip()
+
+
+def commit(repo: Path, subject: str, files: dict = None, body: str = "") -> str:
+    """Write ``files`` (path -> content), commit everything and return the new SHA."""
+    for name, content in (files or {}).items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    git(repo, "add", "-A")
+    message = f"{subject}\n\n{body}" if body else subject
+    git(repo, "commit", "-q", "--allow-empty", "-m", message)
+    return git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    """Fixed git identity and dates, no daemon, and no state left over from other tests."""
+    home = tmp_path / "home"
+    home.mkdir()
+    for key, value in {
+        "HOME": str(home),
+        "GIT_CONFIG_NOSYSTEM": "1",
+        "GIT_AUTHOR_NAME": "Ada",
+        "GIT_AUTHOR_EMAIL": "ada@example.com",
+        "GIT_COMMITTER_NAME": "Ada",
+        "GIT_COMMITTER_EMAIL": "ada@example.com",
+        "GIT_AUTHOR_DATE": "2024-01-01T00:00:00+00:00",
+        "GIT_COMMITTER_DATE": "2024-01-01T00:00:00+00:00",
+        "VUTIL_NO_DAEMON": "1",
+        "VUTIL_NO_CACHE": "1",
+    }.items():
+        monkeypatch.setenv(key, value)
+    for key in ("GIT_DIR", "GIT_WORK_TREE", core.BACKEND_ENV):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setattr(core, "_session", None)
+    monkeypatch.setattr(core, "_backend", None)
+    monkeypatch.setattr(core, "_native", None)
+    monkeypatch.setattr(reachability, "_index", None)
+    monkeypatch.setattr(cache, "_cache", None)
+    yield
+    if core._session is not None:
+        core._session.close()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch) -> Path:
+    """
+    A repository with the working directory switched into it::
+
+        * (HEAD -> main) chore: move a.py into src/
+        *   (tag: v0.2.0) Merge branch 'feature'
+        |\\
+        | * (feature) fix: handle empty input
+        * | docs: describe usage
+        |/
+        * feat: add b
+        * (tag: v0.1.0, annotated) chore: initial import
+    """
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    commit(path, "chore: initial import", {"a.py": "print('a')\n", "README.md": "# demo\n"})
+    git(path, "tag", "-a", "v0.1.0", "-m", "first release")
+    commit(path, "feat: add b", {"b.py": "print('b')\n"})
+    git(path, "checkout", "-q", "-b", "feature")
+    commit(path, "fix: handle empty input", {"c.py": "print('c')\n"})
+    git(path, "checkout", "-q", "main")
+    commit(path, "docs: describe usage", {"README.md": "# demo\n\nusage\n"})
+    git(path, "merge", "-q", "--no-ff", "-m", "Merge branch 'feature'", "feature")
+    git(path, "tag", "v0.2.0")
+    (path / "src").mkdir()
+    git(path, "mv", "a.py", "src/a.py")
+    commit(path, "chore: move a.py into src/")
+    monkeypatch.chdir(path)
+    return path
@@ -0,0 +1,66 @@
+import sqlite3
+
+from versioning_tool.core import GitRange, iter_log
+from versioning_tool.cache import (
+    SCHEMA_VERSION,
+    CommitCache,
+    classify_commits,
+    commits_in_range,
+    commits_in_ranges,
+)
+from versioning_tool.rules import BumpRules
+
+
+def test_schema_mismatch_drops_old_tables(tmp_path):
+    path = tmp_path / "commits.sqlite"
+    db = sqlite3.connect(path)
+    db.executescript(
+        "CREATE TABLE commits (sha TEXT PRIMARY KEY, message TEXT);"
+        "INSERT INTO commits VALUES ('abc', 'old layout');"
+        "PRAGMA user_version=1;"
+    )
+    db.commit()
+    db.close()
+    with CommitCache(path) as cache:
+        assert cache.db.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert cache.get_many(["abc"]) == {}
+        columns = [row[1] for row in cache.db.execute("PRAGMA table_info(commits)")]
+        assert "files" in columns
+
+
+def test_round_trip_and_reopen(repo, tmp_path):
+    commits = list(iter_log(["main"]))
+    path = tmp_path / "cache" / "commits.sqlite"
+    with CommitCache(path) as cache:
+        cache.put_many(commits)
+    with CommitCache(path) as cache:
+        found = cache.get_many([c.sha for c in commits] + ["0" * 40])
+    assert [found[c.sha] for c in commits] == commits
+    assert "0" * 40 not in found
+
+
+def test_cached_range_matches_a_plain_walk(repo, tmp_path):
+    with CommitCache(tmp_path / "commits.sqlite") as cache:
+        gr = GitRange("v0.1.0", "main")
+        cold = commits_in_range(gr, cache)
+        warm = commits_in_range(gr, cache)
+    assert cold == warm == list(iter_log([gr.spec()]))
+
+
+def test_ranges_from_one_walk(repo, tmp_path):
+    with CommitCache(tmp_path / "commits.sqlite") as cache:
+        for c in (None, cache):
+            by_head = commits_in_ranges("v0.1.0", ["feature", "main", "v0.2.0"], c)
+            for head, commits in by_head.items():
+                assert commits == list(iter_log([f"v0.1.0..{head}"])), head
+
+
+def test_bumps_are_cached_per_rule_set(repo, tmp_path):
+    commits = list(iter_log(["main"]))
+    strict, loose = BumpRules({"minor": ["^feat:"]}), BumpRules({"patch": [".*"]})
+    with CommitCache(tmp_path / "commits.sqlite") as cache:
+        for _ in range(2):
+            assert classify_commits(commits, strict, cache) == [
+                strict.classify_commit(c) for c in commits
+            ]
+            assert set(classify_commits(commits, loose, cache)) == {"patch"}
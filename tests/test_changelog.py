@@ -0,0 +1,90 @@
+import re
+import shutil
+
+import pytest
+
+from versioning_tool.changelog import generate_release_notes, rebuild_changelog, write_changelog
+
+from conftest import PROJ_ROOT, commit, git
+
+CONFIG = {
+    "default_branch": "main",
+    "repo_url": "https://example.com/demo",
+    "changelog": {
+        "main_only": True,
+        "template": "CHANGELOG.md.j2",
+        "header": "Changelog",
+        "group_order": ["⚠️ Breaking Changes", "✨ Features", "🐛 Fixes", "🧰 Other"],
+    },
+}
+
+
+@pytest.fixture
+def project(repo):
+    shutil.copy(PROJ_ROOT / "CHANGELOG.md.j2", repo / "CHANGELOG.md.j2")
+    git(repo, "add", "CHANGELOG.md.j2")
+    git(repo, "commit", "-q", "-m", "chore: add changelog template")
+    (repo / ".git" / "info" / "exclude").write_text("CHANGELOG.md\n")
+    return repo
+
+
+def _sections(text: str) -> dict:
+    """``{version: section text}`` of a rendered changelog."""
+    parts = re.split(r"^## \[([^\]]+)\].*$", text, flags=re.M)
+    return dict(zip(parts[1::2], parts[2::2]))
+
+
+def test_incremental_resume_matches_a_full_run(project):
+    changelog = project / "CHANGELOG.md"
+    write_changelog("0.3.0", CONFIG, project, incremental=True)
+    commit(project, "feat: first new feature")
+    commit(project, "fix: a fix", body="BREAKING CHANGE: api")
+    write_changelog("0.3.0", CONFIG, project, incremental=True)
+    resumed = changelog.read_text(encoding="utf-8")
+
+    changelog.unlink()
+    write_changelog("0.3.0", CONFIG, project, incremental=False)
+    assert resumed == changelog.read_text(encoding="utf-8")
+    assert resumed.count("## [0.3.0]") == 1
+    assert "First new feature" in _sections(resumed)["0.3.0"]
+
+
+def test_incremental_state_is_ignored_for_another_repo_url(project):
+    changelog = project / "CHANGELOG.md"
+    commit(project, "feat: linked (#7)")
+    write_changelog("0.3.0", CONFIG, project, incremental=True)
+    commit(project, "feat: later")
+    write_changelog("0.3.0", dict(CONFIG, repo_url="https://example.com/fork"), project, True)
+    # stored entries carry links to the old URL, so they must be classified again
+    newest = changelog.read_text(encoding="utf-8").split("## [0.3.0]")[1]
+    assert "[#7](https://example.com/fork/pull/7)" in newest
+    assert "Later" in newest
+
+
+def test_rebuild_orders_releases_by_ancestry(project, monkeypatch):
+    # tagged after v0.2.0, but on an older commit: a backported release
+    monkeypatch.setenv("GIT_COMMITTER_DATE", "2024-06-01T00:00:00+00:00")
+    git(project, "tag", "-a", "v0.1.5", "-m", "backport", "main~2^2~1")
+
+    assert rebuild_changelog(CONFIG, project, jobs=1) == 3
+    text = (project / "CHANGELOG.md").read_text(encoding="utf-8")
+    sections = _sections(text)
+    assert list(sections) == ["0.2.0", "0.1.5", "0.1.0"]
+    assert "Add b" in sections["0.1.5"]
+    assert "Add b" not in sections["0.2.0"]
+    assert "Handle empty input" in sections["0.2.0"]
+
+
+def test_contributors_skip_commits_without_a_subject(project, monkeypatch):
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "Bob")
+    git(project, "commit", "-q", "--allow-empty", "--allow-empty-message", "-m", "")
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "Cy")
+    commit(project, "feat: by cy")
+
+    notes = generate_release_notes("0.3.0", CONFIG, project)
+    assert "## Contributors\n\n- Ada\n- Cy\n" in notes
+    assert "- By cy" in notes
+
+    write_changelog("0.3.0", CONFIG, project, incremental=False)
+    section = _sections((project / "CHANGELOG.md").read_text(encoding="utf-8"))["0.3.0"]
+    assert "- Cy" in section and "- Bob" not in section
@@ -0,0 +1,19 @@
+import sys
+
+import pytest
+
+from versioning_tool import core
+from versioning_tool.version_manager import main
+
+
+def test_missing_git_exits_with_a_clear_message(repo, monkeypatch, tmp_path):
+    monkeypatch.setenv("PATH", str(tmp_path))  # no git on it
+    core._have_git.cache_clear()
+    monkeypatch.setattr(sys, "argv", ["vutil", "check"])
+    try:
+        with pytest.raises(SystemExit) as exc:
+            main()
+    finally:
+        core._have_git.cache_clear()
+    assert "git not found on PATH" in str(exc.value.code)
+    assert "vutil check" in str(exc.value.code)
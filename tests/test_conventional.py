@@ -0,0 +1,78 @@
+import pytest
+
+from versioning_tool.core import Commit
+from versioning_tool.conventional import RuleSet, parse_commit, parse_header, parse_message
+from versioning_tool.rules import BumpRules, compile_bump_rules, conventional_commit_bump
+
+BUMP_CFG = {
+    "major": ["^feat!:", "^fix!:", "BREAKING CHANGE"],
+    "minor": ["^feat:"],
+    "patch": ["^fix:", "^perf\\("],
+}
+
+
+@pytest.mark.parametrize(
+    "subject, fields",
+    [
+        ("feat: add x", ("feat", None, False, " add x")),
+        ("fix(parser)!: drop y", ("fix", "parser", True, " drop y")),
+        ("feat(): empty scope", ("feat", "", False, " empty scope")),
+        ("Merge branch 'main'", (None, None, False, "Merge branch 'main'")),
+        ("feat(a(b)): nested", (None, None, False, "feat(a(b)): nested")),
+    ],
+)
+def test_parse_header(subject, fields):
+    cc = parse_header(subject)
+    assert (cc.type, cc.scope, cc.bang, cc.description) == fields
+
+
+def test_breaking_footer_marks_message_breaking():
+    assert parse_message("fix: x\n\nBREAKING CHANGE: y").breaking
+    assert parse_message("fix: x\n\nBREAKING-CHANGE: y").breaking
+    assert not parse_message("fix: x\n\nmentions BREAKING CHANGE: in prose\nonly").breaking
+
+
+def test_parse_commit_uses_trailers():
+    cc = parse_commit(Commit("1" * 40, "refactor: y", body="BREAKING CHANGE: z"))
+    assert cc.type == "refactor" and cc.breaking
+
+
+def test_ruleset_header_literal_and_regex_rules():
+    rules = RuleSet(["^feat:", "hotfix", "^perf\\(", "(?i)^revert"])
+    assert rules.match(parse_header("feat: a"), "feat: a")
+    assert not rules.match(parse_header("feat(x): a"), "feat(x): a")  # scoped: "^feat:" fails
+    assert rules.match(parse_header("chore: hotfix"), "chore: hotfix")
+    assert rules.match(parse_header("perf(db): a"), "perf(db): a")
+    assert rules.match(parse_header("REVERT a"), "REVERT a")
+    assert not rules.match(parse_header("docs: a"), "docs: a")
+
+
+def test_ruleset_keeps_backreferences_pointing_at_their_own_group():
+    # folded into one alternation, "\1" would refer to the first pattern's group
+    rules = RuleSet(["(x)y", "^(\\w+): \\1"])
+    assert rules.match(parse_header("fix: fix"), "fix: fix")
+    assert not rules.match(parse_header("fix: feat"), "fix: feat")
+
+
+def test_bump_rules_pick_highest_level():
+    rules = BumpRules(BUMP_CFG)
+    assert rules.classify("feat: a") == "minor"
+    assert rules.classify("feat!: a") == "major"
+    assert rules.classify("fix: a\n\nBREAKING CHANGE: b") == "major"
+    assert rules.classify("perf(db): a") == "patch"
+    assert rules.classify("docs: a") is None
+    assert rules.highest(["docs: a", "fix: b", "feat: c"]) == "minor"
+    assert BumpRules.highest_of([None, "patch", "major", "minor"]) == "major"
+    assert conventional_commit_bump(["chore: a"], BUMP_CFG) is None
+
+
+def test_classify_commit_matches_classify():
+    rules = BumpRules(BUMP_CFG)
+    c = Commit("2" * 40, "fix: a", body="prose\n\nBREAKING CHANGE: b")
+    assert rules.classify_commit(c) == rules.classify(c.message) == "major"
+
+
+def test_compiled_rules_are_reused_and_fingerprinted():
+    assert compile_bump_rules(BUMP_CFG) is compile_bump_rules(dict(BUMP_CFG))
+    other = BumpRules({**BUMP_CFG, "patch": ["^fix:"]})
+    assert other.fingerprint != BumpRules(BUMP_CFG).fingerprint
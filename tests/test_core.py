@@ -0,0 +1,121 @@
+import asyncio
+import subprocess
+
+import pytest
+
+from versioning_tool.core import (
+    Commit,
+    GitRange,
+    GitSession,
+    find_git_dir,
+    iter_commits,
+    iter_log,
+    parse_trailers,
+    run_coroutine,
+)
+
+from conftest import commit, git
+
+
+def test_iter_log_reads_fields_and_files(repo):
+    commits = list(iter_commits(GitRange("v0.1.0", "main")))
+    assert [c.subject for c in commits] == [
+        "chore: move a.py into src/",
+        "Merge branch 'feature'",
+        "docs: describe usage",
+        "fix: handle empty input",
+        "feat: add b",
+    ]
+    merge = commits[1]
+    assert len(merge.parents) == 2
+    assert merge.files == []
+    assert commits[3].files == ["c.py"]
+    assert commits[4].author == "Ada"
+    assert commits[4].sha == git(repo, "rev-parse", "main~2^1")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_log_keeps_bodies_across_chunks(repo, chunk_size):
+    # "é" is two bytes, so small chunks split it between reads
+    body = "Line one\n\nRefs: #12\nBREAKING CHANGE: drops the old api"
+    sha = commit(repo, "feat!: reworké", {"d.py": "x\n"}, body=body)
+    head = next(iter_log(["-1", "HEAD"], chunk_size=chunk_size))
+    assert head.sha == sha
+    assert head.subject == "feat!: reworké"
+    assert head.body == body
+    assert head.files == ["d.py"]
+    assert head.trailers == [("Refs", "#12"), ("BREAKING CHANGE", "drops the old api")]
+
+
+def test_iter_log_stops_git_when_abandoned(repo):
+    walk = iter_log(["main"], chunk_size=16)
+    assert next(walk).subject == "chore: move a.py into src/"
+    walk.close()  # must not raise for the SIGPIPE'd git
+
+
+def test_iter_log_raises_for_bad_revision(repo):
+    with pytest.raises(subprocess.CalledProcessError):
+        list(iter_log(["no-such-branch"]))
+
+
+@pytest.mark.parametrize(
+    "body, expected",
+    [
+        ("Signed-off-by: Ada <a@b>", [("Signed-off-by", "Ada <a@b>")]),
+        ("Fixes #12\nRefs: 7", [("Fixes", "12"), ("Refs", "7")]),
+        ("text\n\nBREAKING CHANGE: gone\n  and more", [("BREAKING CHANGE", "gone and more")]),
+        ("BREAKING-CHANGE: x", [("BREAKING-CHANGE", "x")]),
+        ("Refs: 1\nnot a trailer", []),
+        ("Refs: 1\n\njust prose", []),
+        ("", []),
+    ],
+)
+def test_parse_trailers(body, expected):
+    assert parse_trailers(body) == expected
+
+
+def test_rule_text_adds_breaking_footers_only():
+    c = Commit("0" * 40, "feat: x", body="prose\n\nRefs: 1\nBREAKING CHANGE: api")
+    assert c.rule_text == "feat: x\nBREAKING CHANGE: api"
+    assert Commit("0" * 40, "fix: y", body="Refs: 1").rule_text == "fix: y"
+
+
+def test_session_memo_drops_only_entries_of_moved_refs(repo):
+    with GitSession() as session:
+        session.run(["rev-parse", "feature"])
+        session.run(["rev-parse", "main"])
+        session.run(["for-each-ref", "refs/tags"])
+        session.run(["rev-parse", "--git-common-dir"])
+        session.read_object("feature^{commit}")
+        session.read_object(git(repo, "rev-parse", "main"))
+        session.invalidate({"refs/heads/feature"})
+        assert set(session._runs) == {("rev-parse", "main"), ("rev-parse", "--git-common-dir")}
+        assert list(session._objects) == [git(repo, "rev-parse", "main")]
+
+
+def test_session_memo_follows_head(repo):
+    with GitSession() as session:
+        before = session.run(["rev-parse", "HEAD"])
+        commit(repo, "chore: later")
+        assert session.run(["rev-parse", "HEAD"]) == before  # memoized
+        session.invalidate({"refs/heads/main", "HEAD"})
+        assert session.run(["rev-parse", "HEAD"]) == git(repo, "rev-parse", "HEAD")
+
+
+def test_find_git_dir_from_subdirectory_and_worktree(repo, monkeypatch, tmp_path):
+    monkeypatch.chdir(repo / "src")
+    assert find_git_dir() == repo / ".git"
+    git(repo, "worktree", "add", "-q", str(tmp_path / "wt"), "feature")
+    monkeypatch.chdir(tmp_path / "wt")
+    assert find_git_dir() == (repo / ".git" / "worktrees" / "wt").resolve()
+
+
+def test_run_coroutine_inside_running_loop():
+    async def answer():
+        return 42
+
+    async def caller():
+        return run_coroutine(answer())
+
+    assert run_coroutine(answer()) == 42
+    assert asyncio.run(caller()) == 42
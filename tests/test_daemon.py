@@ -0,0 +1,48 @@
+import subprocess
+
+from versioning_tool import daemon
+from versioning_tool.cache import CACHE_DIRNAME
+from versioning_tool.daemon import _Watcher
+
+from conftest import commit, git
+
+
+def _watcher(repo) -> _Watcher:
+    git_dir = repo / ".git"
+    return _Watcher(git_dir, git_dir, repo / "versioning.yaml")
+
+
+def test_watcher_reports_moved_refs(repo):
+    watcher = _watcher(repo)
+    assert watcher.changed_refs() == set()
+    commit(repo, "feat: x")
+    assert watcher.changed_refs() == {"refs/heads/main", "HEAD"}  # main is checked out
+    git(repo, "tag", "v9.0.0")
+    assert watcher.changed_refs() == {"refs/tags/v9.0.0"}
+    git(repo, "checkout", "-q", "feature")
+    assert watcher.changed_refs() == {"HEAD"}
+    assert watcher.changed_refs() == set()
+
+
+def test_watcher_diffs_packed_refs(repo):
+    git(repo, "pack-refs", "--all")
+    watcher = _watcher(repo)
+    git(repo, "update-ref", "refs/tags/v0.2.0", "main~2")
+    git(repo, "pack-refs", "--all")
+    assert watcher.changed_refs() == {"refs/tags/v0.2.0"}
+
+
+def test_socket_path_does_not_run_git(repo, monkeypatch):
+    def no_git(*args, **kwargs):
+        raise AssertionError(f"started {args}")
+
+    monkeypatch.setattr(subprocess, "Popen", no_git)
+    monkeypatch.setattr(subprocess, "run", no_git)
+    assert daemon.socket_path() == repo / ".git" / CACHE_DIRNAME / daemon.SOCKET_NAME
+    monkeypatch.delenv("VUTIL_NO_DAEMON")
+    assert daemon.request("check") is None  # nothing listening
+
+
+def test_socket_path_outside_a_repository(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert daemon.socket_path() is None
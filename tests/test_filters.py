@@ -0,0 +1,72 @@
+import fnmatch
+import warnings
+
+import pytest
+
+from versioning_tool.core import CommitFilter, FileMatcher, filter_commits, filter_files
+
+PATHS = [
+    "README.md",
+    "docs/index.md",
+    "docs/api/ref.md",
+    "src/app.py",
+    "src/app_test.py",
+    "tests/test_app.py",
+    "a/b/c/deep.lock",
+    "x.py",
+    "]weird[.py",
+    "a-b.py",
+    "&.py",
+]
+
+
+def test_literal_prefix_suffix_and_recursive_globs():
+    m = FileMatcher(["README.md", "docs/**", "*.lock", "tests/*", "**/app_test.py"])
+    assert m.filter(PATHS) == ["src/app.py", "x.py", "]weird[.py", "a-b.py", "&.py"]
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "[z-a].py",  # reversed range matches nothing
+        "[a-]*.py",  # trailing hyphen is literal
+        "[!x].py",
+        "[]]*",
+        "[[]*",
+        "[&&]*",
+        "[~~]*",
+        "[||]*",
+        "[a--]*",
+        "[!]",
+        "[",
+        "src/[a-c]pp.py",
+        "?.py",
+    ],
+)
+def test_glob_classes_match_like_fnmatch(pattern):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # e.g. FutureWarning for "[&&]" read as a set operation
+        m = FileMatcher([pattern])
+    for path in PATHS:
+        assert m.matches(path) == fnmatch.fnmatch(path, pattern), path
+
+
+def test_one_bad_glob_does_not_break_the_others():
+    assert filter_files(["a.py", "b.txt", "c.md"], ["[z-a]", "*.py", "c.[m]d"]) == ["b.txt"]
+
+
+def test_commit_filter_names_the_dropping_rule():
+    f = CommitFilter(["^Merge ", "(?P<tag>wip)", "^chore\\(deps\\)"])
+    assert f.match("Merge branch 'x'") == "^Merge "
+    assert f.match("feat: wip stuff") == "(?P<tag>wip)"
+    assert f.match("chore(deps): bump") == "^chore\\(deps\\)"
+    assert f.match("feat: done") is None
+
+
+def test_commit_filter_backreferences_and_late_flags():
+    f = CommitFilter(["(\\w+) \\1", "(?i)^revert"])  # the flag is only legal first
+    assert f.match("fix the the typo") == "(\\w+) \\1"
+    assert f.match("Revert: x") == "(?i)^revert"
+    assert f.match("fix the typo") is None
+    assert filter_commits(["a", "b b", "c"], ["(\\w) \\1"]) == ["a", "c"]
+    assert filter_commits(["a", "b"], []) == ["a", "b"]
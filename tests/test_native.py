@@ -0,0 +1,89 @@
+import pytest
+
+from versioning_tool.core import GitSession
+from versioning_tool.objects import NativeBackend
+
+from conftest import commit, git
+
+
+@pytest.fixture(params=["loose", "packed", "commit-graph"])
+def layout(request, repo):
+    if request.param != "loose":
+        git(repo, "repack", "-adq")
+        git(repo, "pack-refs", "--all")
+    if request.param == "commit-graph":
+        git(repo, "commit-graph", "write", "--reachable")
+    return repo
+
+
+def _short(repo, rev: str, n: int = 7) -> str:
+    return git(repo, "rev-parse", rev)[:n]
+
+
+def test_resolve_matches_git(layout):
+    specs = [
+        "HEAD",
+        "@",
+        "main",
+        "heads/main",
+        "refs/heads/main",
+        "feature",
+        "v0.1.0",
+        "v0.1.0^{}",
+        "v0.1.0^{commit}",
+        "v0.1.0^{tag}",
+        "v0.1.0^{object}",
+        "v0.2.0^{tree}",
+        "HEAD~1",
+        "HEAD~1^2",
+        "HEAD~1^1~1",
+        "HEAD^^^",
+        "HEAD~1^0",
+        "HEAD~0",
+        "v0.2.0^2~1",
+        "v0.1.0~1",
+        "HEAD~1^3",
+        "HEAD@{0}",
+        _short(layout, "HEAD~1^2"),
+        _short(layout, "HEAD~2", 4) + "^{commit}",
+    ]
+    with GitSession() as session:
+        native = NativeBackend()
+        for spec in specs:
+            assert native.resolve(spec) == session.resolve(spec), spec
+
+
+@pytest.mark.parametrize(
+    "spec", ["HEAD~x", "HEAD^{nope}", "HEAD^{", "main@{u}", "no-such-ref", "zzzzzzz", "", "~1"]
+)
+def test_resolve_returns_none_for_malformed_or_missing(layout, spec):
+    assert NativeBackend().resolve(spec) is None
+
+
+def test_commit_queries_match_git(layout):
+    native = NativeBackend()
+    with GitSession() as session:
+        for rev in ("HEAD", "HEAD~1", "v0.1.0", "feature"):
+            assert native.commit_sha(rev) == session.commit_sha(rev)
+            assert native.commit_parents(rev) == session.commit_parents(rev)
+            assert native.commit_message(rev) == session.commit_message(rev)
+        assert native.current_branch() == session.current_branch() == "main"
+        assert native.list_tags() == session.list_tags()
+        assert native.list_tags(merged="feature") == session.list_tags(merged="feature")
+        assert native.list_branches() == session.list_branches()
+
+
+def test_changed_files_pairs_pure_renames(layout):
+    native = NativeBackend()
+    with GitSession() as session:
+        for base, head in [("HEAD~1", "HEAD"), ("v0.1.0", "main"), ("main", "v0.1.0")]:
+            assert native.changed_files(base, head) == session.changed_files(base, head)
+    assert native.changed_files("HEAD~1", "HEAD") == ["src/a.py"]
+
+
+def test_changed_files_lists_both_paths_of_an_edited_move(repo):
+    git(repo, "mv", "b.py", "renamed.py")
+    (repo / "renamed.py").write_text("print('changed')\n")
+    commit(repo, "refactor: move and edit b")
+    # git's similarity detection would pair these; the native reader only pairs exact moves
+    assert NativeBackend().changed_files("HEAD~1", "HEAD") == ["b.py", "renamed.py"]
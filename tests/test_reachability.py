@@ -0,0 +1,62 @@
+import subprocess
+
+import pytest
+
+from versioning_tool import reachability
+from versioning_tool.core import list_tags
+from versioning_tool.reachability import ReachabilityIndex
+
+from conftest import commit, git
+
+
+@pytest.fixture(params=["rev-list", "commit-graph"])
+def index(request, repo):
+    if request.param == "commit-graph":
+        git(repo, "commit-graph", "write", "--reachable")
+    return ReachabilityIndex.load()
+
+
+def test_is_ancestor_matches_merge_base(index, repo):
+    revs = ["main", "main~1", "main~2", "feature", "v0.1.0", "v0.2.0^1", "main~1^2"]
+    for a in revs:
+        for b in revs:
+            expected = subprocess.run(["git", "merge-base", "--is-ancestor", a, b]).returncode == 0
+            assert index.is_ancestor(a, b) == expected, (a, b)
+
+
+def test_missing_revisions_are_never_ancestors(index):
+    assert not index.is_ancestor("no-such-ref", "main")
+    assert not index.is_ancestor("main", "0" * 40 + "x")
+
+
+def test_generations_order_parents_first(index, repo):
+    shas = git(repo, "rev-list", "--parents", "main").splitlines()
+    for line in shas:
+        sha, *parents = line.split()
+        assert all(index.generation(p) < index.generation(sha) for p in parents)
+    assert index.generation(git(repo, "rev-parse", "v0.1.0^{commit}")) == 1
+
+
+def test_ancestors_among_and_tags_on(index, repo):
+    feature, docs = git(repo, "rev-parse", "feature"), git(repo, "rev-parse", "main~1^1")
+    assert index.ancestors_among([feature, docs], "feature") == {feature}
+    assert index.ancestors_among([feature, docs], "main") == {feature, docs}
+    git(repo, "tag", "v0.1.1", "feature")
+    assert sorted(t.name for t in index.tags_on("feature", list_tags())) == ["v0.1.0", "v0.1.1"]
+
+
+def test_commits_newer_than_the_graph_are_found(repo):
+    git(repo, "commit-graph", "write", "--reachable")
+    index = ReachabilityIndex.load()
+    new = commit(repo, "feat: after the graph")
+    assert index.is_ancestor("v0.2.0", new)
+    assert index.generation(new) == index.generation(git(repo, "rev-parse", "HEAD~1")) + 1
+
+
+def test_forget_names_after_refs_move(repo):
+    index = reachability.reachability()
+    assert index.resolve("main") == git(repo, "rev-parse", "main")
+    new = commit(repo, "feat: moves main")
+    assert index.resolve("main") != new  # cached name
+    reachability.forget_names()
+    assert index.resolve("main") == new
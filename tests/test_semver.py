@@ -0,0 +1,50 @@
+import pytest
+
+from versioning_tool.semver import SemVer, latest_version, sort_versions
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1.2.3", "1.2.3"),
+        ("v1.2.3", "1.2.3"),
+        ("1.2", "1.2.0"),
+        ("1.2.3-alpha.1", "1.2.3-alpha.1"),
+        ("1.2.3a1", "1.2.3-a.1"),
+        ("1.2.3rc2", "1.2.3-rc.2"),
+        ("1.2.3+build.5", "1.2.3"),
+        ("1!1.2.3.post1", "1.2.3"),
+    ],
+)
+def test_parse(text, expected):
+    assert str(SemVer.parse(text)) == expected
+
+
+def test_parse_rejects_garbage():
+    with pytest.raises(ValueError):
+        SemVer.parse("not-a-version")
+
+
+def test_prereleases_sort_before_their_release():
+    ordered = ["1.0.0-alpha.1", "1.0.0-alpha.2", "1.0.0-beta.1", "1.0.0-rc.1", "1.0.0", "1.0.1"]
+    assert sorted(SemVer.parse(v) for v in reversed(ordered)) == [SemVer.parse(v) for v in ordered]
+    assert SemVer.parse("1.0.0a1") == SemVer.parse("1.0.0-alpha.1")  # same channel
+
+
+def test_bump_and_next_prerelease():
+    v = SemVer.parse("1.2.3-beta.2")
+    assert str(v.bump("major")) == "2.0.0"
+    assert str(v.bump("minor")) == "1.3.0"
+    assert str(v.bump("patch")) == "1.2.4"
+    assert str(v.bump(None)) == "1.2.3"
+    assert str(v.next_prerelease("beta")) == "1.2.3-beta.3"
+    assert str(v.next_prerelease("rc")) == "1.2.3-rc.1"
+    assert str(SemVer.parse("1.2.3").next_prerelease("alpha")) == "1.2.3-alpha.1"
+
+
+def test_sort_and_latest():
+    names = ["v0.10.0", "v0.9.0", "junk", "v1.0.0-rc.1", "v0.2.0"]
+    assert sort_versions(names) == ["junk", "v0.2.0", "v0.9.0", "v0.10.0", "v1.0.0-rc.1"]
+    assert latest_version(names) == "v1.0.0-rc.1"
+    assert latest_version(names, stable_only=True) == "v0.10.0"
+    assert latest_version(["junk"]) is None
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import subprocess
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from versioning_tool.core import Commit, GitRange, get_session, iter_log
+
+CACHE_DIRNAME = "vutil-cache"
+SCHEMA_VERSION = 2
+_LOOKUP_CHUNK = 500  # SQLite variables / git argv entries per batch
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    parents TEXT NOT NULL,
+    author TEXT NOT NULL,
+    date TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    files TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS bumps (
+    sha TEXT NOT NULL,
+    rules TEXT NOT NULL,
+    bump TEXT,
+    PRIMARY KEY (sha, rules)
+) WITHOUT ROWID;
+"""
+
+
+def _chunks(items: List[str], size: int = _LOOKUP_CHUNK) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def cache_dir() -> Optional[Path]:
+    """Return ``<git common dir>/vutil-cache``, or None outside a repository."""
+    try:
+        git_dir = get_session().run(["rev-parse", "--git-common-dir"])
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    return Path(git_dir).resolve() / CACHE_DIRNAME
+
+
+class CommitCache:
+    """
+    SQLite store of parsed commit metadata keyed by SHA, safe to share between threads.
+
+    Commits are immutable, so an entry never needs revalidating; the schema
+    version lives in ``PRAGMA user_version`` and a mismatch simply drops the
+    old tables. Bump classifications are keyed by (SHA, rules fingerprint).
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS commits; DROP TABLE IF EXISTS bumps;")
+            self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "CommitCache":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_many(self, shas: List[str]) -> Dict[str, Commit]:
+        with self._lock:
+            return self._get_many(shas)
+
+    def _get_many(self, shas: List[str]) -> Dict[str, Commit]:
+        found = {}
+        for chunk in _chunks(shas):
+            marks = ",".join("?" * len(chunk))
+            rows = self.db.execute(
+                f"SELECT sha, parents, author, date, subject, body, files FROM commits"
+                f" WHERE sha IN ({marks})",
+                chunk,
+            )
+            for sha, parents, author, date, subject, body, files in rows:
+                found[sha] = Commit(
+                    sha=sha,
+                    subject=subject,
+                    body=body,
+                    author=author,
+                    date=date,
+                    parents=parents.split(),
+                    files=files.split("\x00") if files else [],
+                )
+        return found
+
+    def put_many(self, records: Iterable[Commit]):
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        r.sha,
+                        " ".join(r.parents),
+                        r.author,
+                        r.date,
+                        r.subject,
+                        r.body,
+                        "\x00".join(r.files),
+                    )
+                    for r in records
+                ),
+            )
+
+    def get_bumps(self, shas: List[str], rules: str) -> Dict[str, Optional[str]]:
+        found = {}
+        with self._lock:
+            for chunk in _chunks(shas):
+                marks = ",".join("?" * len(chunk))
+                rows = self.db.execute(
+                    f"SELECT sha, bump FROM bumps WHERE rules = ? AND sha IN ({marks})",
+                    [rules, *chunk],
+                )
+                found.update(rows)
+        return found
+
+    def put_bumps(self, rules: str, bumps: Dict[str, Optional[str]]):
+        with self._lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO bumps VALUES (?, ?, ?)",
+                ((sha, rules, bump) for sha, bump in bumps.items()),
+            )
+
+    def close(self):
+        self.db.close()
+
+
+_cache: Optional[CommitCache] = None
+
+
+def open_cache() -> Optional[CommitCache]:
+    """
+    Return the repository's commit cache, or None when caching is disabled
+    (``VUTIL_NO_CACHE``) or unavailable.
+    """
+    global _cache
+    if os.getenv("VUTIL_NO_CACHE"):
+        return None
+    if _cache is None:
+        root = cache_dir()
+        if root is None:
+            return None
+        try:
+            _cache = CommitCache(root / "commits.sqlite")
+        except (OSError, sqlite3.Error):
+            return None
+    return _cache
+
+
+def commits_in_range(gr: GitRange, cache: Optional[CommitCache] = None) -> List[Commit]:
+    """
+    Return the commits in ``gr`` (newest first), parsing only those the cache
+    has not seen before.
+    """
+    cache = cache or open_cache()
+    if cache is None:
+        return list(iter_log([gr.spec()]))
+
+    out = get_session().run(["rev-list", gr.spec()])
+    shas = out.split()
+    known = _load(shas, cache)
+    return [known[sha] for sha in shas]
+
+
+def _load(shas: List[str], cache: CommitCache) -> Dict[str, Commit]:
+    """Records for ``shas``, parsing (and caching) only the ones not seen before."""
+    known = cache.get_many(shas)
+    missing = [sha for sha in shas if sha not in known]
+    for chunk in _chunks(missing):
+        fresh = list(iter_log(["--no-walk=unsorted", *chunk]))
+        cache.put_many(fresh)
+        known.update((r.sha, r) for r in fresh)
+    return known
+
+
+def commits_in_ranges(
+    base: str, heads: Iterable[str], cache: Optional[CommitCache] = None
+) -> Dict[str, List[Commit]]:
+    """
+    Return ``{head: commits in base..head}`` for many heads from a single walk.
+
+    One ``rev-list`` covers the union of the ranges (history shared by several
+    heads is visited once). Each commit then gets a bitset of the heads that
+    reach it, pushed from children to parents in ``--date-order`` (which never
+    shows a parent before its children), and the per-head lists are read off the
+    bitsets, each in walk order.
+    """
+    heads = list(dict.fromkeys(heads))
+    if not heads:
+        return {}
+    walk = ["--date-order", *heads] + (["--not", base] if base else [])
+
+    cache = cache or open_cache()
+    if cache is None:
+        records = {r.sha: r for r in iter_log(walk)}
+        order = list(records)
+        parents = {sha: r.parents for sha, r in records.items()}
+    else:
+        order, parents = [], {}
+        for line in get_session().run(["rev-list", "--parents", *walk]).splitlines():
+            sha, *rest = line.split()
+            order.append(sha)
+            parents[sha] = rest
+        records = _load(order, cache)
+
+    session = get_session()
+    bits: Dict[str, int] = {}
+    for i, head in enumerate(heads):
+        sha = session.commit_sha(head)
+        if sha in parents:
+            bits[sha] = bits.get(sha, 0) | 1 << i
+    out: List[List[Commit]] = [[] for _ in heads]
+    for sha in order:
+        mask = bits.pop(sha, 0)
+        for parent in parents[sha]:
+            if parent in parents:
+                bits[parent] = bits.get(parent, 0) | mask
+        record = records[sha]
+        while mask:
+            low = mask & -mask
+            out[low.bit_length() - 1].append(record)
+            mask ^= low
+    return dict(zip(heads, out))
+
+
+def classify_commits(
+    commits: List[Commit], rules, cache: Optional[CommitCache] = None
+) -> List[Optional[str]]:
+    """Bump level per commit (subject and breaking footers) under ``rules``, memoized per SHA."""
+    cache = cache or open_cache()
+    if cache is None:
+        return [rules.classify_commit(c) for c in commits]
+
+    known = cache.get_bumps([c.sha for c in commits], rules.fingerprint)
+    fresh = {c.sha: rules.classify_commit(c) for c in commits if c.sha not in known}
+    if fresh:
+        cache.put_bumps(rules.fingerprint, fresh)
+        known.update(fresh)
+    return [known[c.sha] for c in commits]
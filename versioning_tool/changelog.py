@@ -1,12 +1,33 @@
+import os
 import re
+import json
+import shutil
 import datetime
+import asyncio
+import tempfile
+import subprocess
 
 from pathlib import Path
+from functools import lru_cache
 from collections import defaultdict, Counter
-from typing import Dict, List, Tuple, Optional
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
 
-from versioning_tool.core import run_git, last_tag_on_branch
+from versioning_tool.core import (
+    Commit,
+    GitRange,
+    get_session,
+    last_tag_on_branch_async,
+    list_tags,
+    run_coroutine,
+)
+from versioning_tool.cache import cache_dir, commits_in_range
+from versioning_tool.conventional import ConventionalCommit, RuleSet, parse_commit, parse_header
+from versioning_tool.reachability import reachability
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+STATE_FILE = "changelog-state.json"
 
 SECTION_RULES = [
     ("⚠️ Breaking Changes", [r"BREAKING CHANGE", r"^feat!:"]),
@@ -16,14 +37,26 @@ SECTION_RULES = [
 ]
 
 
-def _clean_message(msg: str, repo_url: Optional[str] = None) -> str:
+# Conventional prefixes stripped from changelog entries (scoped headers are kept)
+_CLEAN_TYPES = set("feat fix add remove change chore refactor docs test ci style".split())
+
+
+@lru_cache(maxsize=None)
+def _section_rules() -> List[Tuple[str, RuleSet]]:
+    return [(title, RuleSet(pats)) for title, pats in SECTION_RULES]
+
+
+def _clean_message(
+    msg: str, repo_url: Optional[str] = None, cc: Optional[ConventionalCommit] = None
+) -> str:
     """Normalize commit messages for changelog readability."""
     original = msg.strip()
+    cc = cc or parse_header(original)
 
     # Strip conventional prefixes
-    msg = re.sub(
-        r"^(feat|fix|add|remove|change|chore|refactor|docs|test|ci|style)!?:\s*", "", original
-    )
+    msg = original
+    if cc.type in _CLEAN_TYPES and cc.scope is None:
+        msg = cc.description.strip()
 
     # Capitalize first letter
     msg = msg[:1].upper() + msg[1:] if msg else original
@@ -38,30 +71,47 @@ def _clean_message(msg: str, repo_url: Optional[str] = None) -> str:
     return msg
 
 
-def _get_contributors(since_ref: str) -> List[str]:
-    """Get list of contributors since last release"""
-    try:
-        contributors = run_git(
-            ["log", f"{since_ref}..HEAD", "--pretty=format:%an", "--reverse"]
-        ).splitlines()
-        return sorted(set(contributors))
-    except Exception:
-        return []
+def _contributors(commits: List[Commit]) -> List[str]:
+    return sorted({c.author for c in commits})
+
+
+def _changelog_entries(commits: List[Commit], repo_url: Optional[str] = None) -> List[dict]:
+    """
+    Classify commits into sections (None when no rule matches); ``BREAKING CHANGE``
+    footers count as well as subjects. Entries hold only what rendering needs, so
+    they can be stored as is.
+    """
+    entries = []
+    for c in commits:
+        cc = parse_commit(c)
+        text = c.rule_text
+        section = next((t for t, rules in _section_rules() if rules.match(cc, text)), None)
+        entries.append(
+            {
+                "sha": c.sha,
+                "subject": _clean_message(c.subject, repo_url, cc),
+                "section": section,
+                "author": c.author,
+            }
+        )
+    return entries
+
+
+def _group_commits(
+    commits: List[Commit], group_order: Optional[List[str]] = None, repo_url: Optional[str] = None
+) -> List[Tuple[str, List[str]]]:
+    """Group commits by type; ``BREAKING CHANGE`` footers count as well as subjects."""
+    return _sections(_changelog_entries(commits, repo_url), group_order)
 
 
-def _group_messages(
-    messages: List[str], group_order: Optional[List[str]] = None, repo_url: Optional[str] = None
+def _sections(
+    entries: List[dict], group_order: Optional[List[str]] = None
 ) -> List[Tuple[str, List[str]]]:
-    """Group commit messages by type."""
-    compiled = [(title, [re.compile(p) for p in pats]) for title, pats in SECTION_RULES]
+    """Bucket classified entries into ``(title, lines)`` sections."""
     buckets: Dict[str, List[str]] = defaultdict(list)
-
-    for m in messages:
-        clean = _clean_message(m, repo_url)
-        for title, regexes in compiled:
-            if any(r.search(m) for r in regexes):
-                buckets[title].append(clean)
-                break
+    for e in entries:
+        if e["section"] is not None:
+            buckets[e["section"]].append(e["subject"])
 
     # Deduplicate but show counts
     for t in buckets:
@@ -79,43 +129,210 @@ def _group_messages(
     return [(t, items) for t, items in buckets.items() if items]
 
 
-def _render(
-    template_path: Path, header: str, entries: List[dict], repo_url: Optional[str] = None
-) -> str:
-    env = Environment(
-        loader=FileSystemLoader(template_path.parent),
+@lru_cache(maxsize=None)
+def _environment(template_dir: Path) -> "Environment":
+    """
+    One Jinja environment per template directory for the life of the process,
+    with compiled templates persisted next to the commit cache.
+    """
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+    bytecode_cache = None
+    root = cache_dir()
+    if root is not None:
+        try:
+            (root / "jinja").mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(root / "jinja"))
+        except OSError:
+            pass
+    return Environment(
+        loader=FileSystemLoader(template_dir),
         autoescape=select_autoescape(),
         trim_blocks=True,
         lstrip_blocks=True,
+        bytecode_cache=bytecode_cache,
     )
-    tpl = env.get_template(template_path.name)
+
+
+def _render(
+    template_path: Path, header: str, entries: List[dict], repo_url: Optional[str] = None
+) -> str:
+    # get_template() keeps the compiled template on the shared environment
+    tpl = _environment(template_path.parent.resolve()).get_template(template_path.name)
     return tpl.render(header=header, releases=entries, repo_url=repo_url)
 
 
+async def _resolve_release_async(main_branch: str) -> Tuple[str, Optional[str]]:
+    """
+    ``(last tag on main, or the root commit when nothing has been tagged yet, commit
+    SHA of main)``, with the two lookups overlapping.
+    """
+    session = get_session()
+
+    async def head() -> Optional[str]:
+        try:
+            return await session.run_async(
+                ["rev-parse", "--verify", "-q", f"{main_branch}^{{commit}}"]
+            )
+        except subprocess.CalledProcessError:
+            return None
+
+    last_tag, sha = await asyncio.gather(last_tag_on_branch_async(main_branch), head())
+    if not last_tag:
+        roots = await session.run_async(["rev-list", "--max-parents=0", main_branch])
+        last_tag = roots.splitlines()[0]
+    return last_tag, sha
+
+
+def _resolve_release(main_branch: str) -> Tuple[str, Optional[str]]:
+    return run_coroutine(_resolve_release_async(main_branch))
+
+
 def collect_since_last_tag_on_main(main_branch: str = "main") -> Tuple[List[str], str]:
     """Collect commit messages since last tag on main branch."""
-    last = (
-        last_tag_on_branch(main_branch)
-        or run_git(["rev-list", "--max-parents=0", main_branch]).splitlines()[0]
-    )
-    msg = run_git(["log", f"{last}..{main_branch}", "--pretty=format:%s"])
-    return [m for m in msg.splitlines() if m.strip()], last
+    last, _ = _resolve_release(main_branch)
+    commits = commits_in_range(GitRange(base=last, head=main_branch))
+    return [c.subject for c in commits if c.subject.strip()], last
+
+
+def _is_ancestor(ancestor: str, head: str) -> bool:
+    """One ``git merge-base --is-ancestor`` call, instead of loading the reachability index."""
+    try:
+        get_session().run(["merge-base", "--is-ancestor", ancestor, head])
+    except subprocess.CalledProcessError:
+        return False  # not an ancestor, or no longer in the repository
+    return True
+
+
+def _load_state() -> Tuple[Optional[Path], dict]:
+    """Return the incremental-changelog state file and its contents."""
+    root = cache_dir()
+    if root is None:
+        return None, {}
+    path = root / STATE_FILE
+    try:
+        return path, json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return path, {}
+
+
+def _release_block(rendered: str) -> str:
+    """Strip the template header, keeping everything from the release heading on."""
+    start = rendered.find("## [")
+    return rendered[start:] if start != -1 else rendered
 
 
-def write_changelog(new_version: str, config: dict, repo_root: Path):
-    """Write or update the changelog with new release information."""
+def _splice_changelog(path: Path, rendered: str, replace_version: Optional[str] = None):
+    """
+    Insert a rendered release before the first ``## [`` heading of ``path``.
+
+    The file is streamed line by line into a temporary file next to it, which
+    then atomically replaces the original, so memory use does not grow with
+    the changelog. With ``replace_version``, a leading section for that
+    version is dropped in favour of the new one instead of being kept below it.
+    """
+    if not path.exists():
+        path.write_text(rendered.rstrip() + "\n", encoding="utf-8")
+        return
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with open(path, encoding="utf-8") as src, os.fdopen(fd, "w", encoding="utf-8") as dst:
+            prefix = []
+            for line in src:
+                if line.startswith("## ["):
+                    break
+                prefix.append(line)
+            else:
+                # No existing releases: put the full rendering on top
+                dst.write(rendered.rstrip() + "\n\n" + "".join(prefix).rstrip() + "\n")
+                line = None
+
+            if line is not None:
+                head = "".join(prefix).rstrip()
+                if head:
+                    dst.write(head + "\n\n")
+                dst.write(_release_block(rendered).rstrip() + "\n")
+
+                if replace_version and line.startswith(f"## [{replace_version}]"):
+                    # Skip the stale section up to the next release heading
+                    line = next((l for l in src if l.startswith("## [")), None)
+
+                if line is not None:
+                    dst.write("\n" + line)
+                    last = line
+                    for last in src:
+                        dst.write(last)
+                    if not last.endswith("\n"):
+                        dst.write("\n")
+        shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _collect_release(
+    base: str,
+    head: str,
+    repo_url: Optional[str] = None,
+    group_order: Optional[List[str]] = None,
+    known: Optional[List[dict]] = None,
+) -> Tuple[List[Tuple[str, List[str]]], List[str], List[dict]]:
+    """
+    ``(sections, contributors, entries)`` of a release from one walk over
+    ``base..head``; ``known`` entries, already classified for the commits below
+    ``base``, are kept after the new ones.
+    """
+    commits = [c for c in commits_in_range(GitRange(base, head)) if c.subject.strip()]
+    entries = _changelog_entries(commits, repo_url) + (known or [])
+    contributors = sorted({e["author"] for e in entries})
+    return _sections(entries, group_order), contributors, entries
+
+
+def write_changelog(
+    new_version: str, config: dict, repo_root: Path, incremental: Optional[bool] = None
+):
+    """
+    Write or update the changelog with new release information.
+
+    In incremental mode the last processed commit of the release and its
+    classified entries are stored in the repo cache; regenerating the same
+    version then only classifies the commits that landed since and patches that
+    release's section in place.
+    """
     if not config.get("changelog", {}).get("main_only", True):
         return
+    if incremental is None:
+        incremental = config.get("changelog", {}).get("incremental", False)
 
     main_branch = config.get("default_branch", "main")
-    messages, last_tag = collect_since_last_tag_on_main(main_branch)
+    last_tag, head = _resolve_release(main_branch)
 
     repo_url = config.get("repo_url")
-    group_order = config.get("changelog", {}).get("group_order")
-    grouped = _group_messages(messages, group_order, repo_url)
+    state_path, state = _load_state() if incremental else (None, {})
+    resume = (
+        head
+        and state.get("version") == new_version
+        and state.get("base") == last_tag
+        and state.get("repo_url") == repo_url
+        and state.get("head")
+        and "entries" in state
+        and (state["head"] == head or _is_ancestor(state["head"], head))
+    )
+
+    changelog_path = repo_root / "CHANGELOG.md"
+    if resume:
+        if state["head"] == head and changelog_path.exists():
+            return  # nothing landed since the last run
+        base, known = state["head"], state["entries"]
+    else:
+        base, known = last_tag, None
 
-    # Get contributors since last release
-    contributors = _get_contributors(last_tag)
+    group_order = config.get("changelog", {}).get("group_order")
+    grouped, contributors, entries = _collect_release(
+        base, head or main_branch, repo_url, group_order, known
+    )
 
     # Determine previous version for comparison links
     previous_version = (
@@ -133,46 +350,112 @@ def write_changelog(new_version: str, config: dict, repo_root: Path):
     template_file = repo_root / config.get("changelog", {}).get("template", "CHANGELOG.md.j2")
     header = config.get("changelog", {}).get("header", "Changelog")
 
-    changelog_path = repo_root / "CHANGELOG.md"
     new_text = _render(template_file, header, [entry], repo_url)
 
-    # Merge with existing changelog
-    prev_content = ""
-    if changelog_path.exists():
-        prev_content = changelog_path.read_text(encoding="utf-8")
-
-        # Try to find where existing releases start to prepend new one
-        first_release_pos = prev_content.find("## [")
-        if first_release_pos != -1:
-            # Insert new release before existing ones
-            merged = (
-                prev_content[:first_release_pos].rstrip()
-                + "\n\n"
-                + new_text.rstrip()
-                + "\n\n"
-                + prev_content[first_release_pos:].rstrip()
-                + "\n"
-            )
-        else:
-            # Append to beginning if no existing releases found
-            merged = new_text.rstrip() + "\n\n" + prev_content.rstrip() + "\n"
+    # Merge with existing changelog, patching this release's section when resuming
+    _splice_changelog(changelog_path, new_text, replace_version=new_version if resume else None)
+
+    if state_path is not None:
+        state = {
+            "version": new_version,
+            "base": last_tag,
+            "head": head,
+            "repo_url": repo_url,
+            "entries": entries,
+        }
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(json.dumps(state), encoding="utf-8")
+
+
+def _tag_version(tag: str) -> str:
+    return tag[1:] if tag.startswith("v") else tag
+
+
+def _render_release(job: tuple) -> str:
+    """Classify and render one release; runs in a worker process during a rebuild."""
+    template_file, header, repo_url, group_order, release, commits = job
+    entry = dict(release, sections=_group_commits(commits, group_order, repo_url))
+    return _render(template_file, header, [entry], repo_url)
+
+
+def rebuild_changelog(config: dict, repo_root: Path, jobs: Optional[int] = None) -> int:
+    """
+    Regenerate CHANGELOG.md from scratch, one release per tag on the default branch.
+
+    Tag-to-tag ranges are collected concurrently, then classified and rendered
+    in a process pool and written newest first. Returns the number of releases.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    main_branch = config.get("default_branch", "main")
+    repo_url = config.get("repo_url")
+    group_order = config.get("changelog", {}).get("group_order")
+    template_file = repo_root / config.get("changelog", {}).get("template", "CHANGELOG.md.j2")
+    header = config.get("changelog", {}).get("header", "Changelog")
+    jobs = jobs or os.cpu_count() or 1
+
+    tags = list_tags(merged=main_branch, sort="creatordate")
+    # Oldest first by ancestry, not tag date, which a re-tagged or backported release
+    # breaks; an ancestor always has the lower generation, ties keep date order
+    index = reachability()
+    tags.sort(key=lambda t: index.generation(t.commit))
+    ranges = [
+        GitRange(base=prev.name if prev else "", head=tag.commit)
+        for prev, tag in zip([None, *tags], tags)
+    ]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        histories = list(pool.map(commits_in_range, ranges))
+
+    work = []
+    for prev, tag, commits in zip([None, *tags], tags, histories):
+        release = {
+            "version": _tag_version(tag.name),
+            "previous_version": (
+                _tag_version(prev.name) if prev and prev.name.startswith("v") else "initial"
+            ),
+            "date": tag.date[:10],
+        }
+        commits = [c for c in commits if c.subject.strip()]
+        release["contributors"] = _contributors(commits)  # same filter as write_changelog
+        work.append((template_file, header, repo_url, group_order, release, commits))
+    work.reverse()  # newest release first
+
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            rendered = list(pool.map(_render_release, work, chunksize=max(1, len(work) // jobs)))
     else:
-        merged = new_text.rstrip() + "\n"
+        rendered = [_render_release(job) for job in work]
 
-    changelog_path.write_text(merged, encoding="utf-8")
+    changelog_path = repo_root / "CHANGELOG.md"
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{changelog_path.name}.", dir=repo_root)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as dst:
+            if rendered:
+                dst.write(rendered[0][: rendered[0].find("## [")].rstrip() + "\n\n")
+            else:
+                dst.write(_render(template_file, header, [], repo_url).rstrip() + "\n")
+            for i, text in enumerate(rendered):
+                dst.write(
+                    _release_block(text).rstrip() + ("\n\n" if i < len(rendered) - 1 else "\n")
+                )
+        if changelog_path.exists():
+            shutil.copymode(changelog_path, tmp_name)
+        os.replace(tmp_name, changelog_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return len(rendered)
 
 
 def generate_release_notes(new_version: str, config: dict, repo_root: Path) -> str:
     """Generate release notes for GitHub releases without modifying the changelog file."""
     main_branch = config.get("default_branch", "main")
-    messages, last_tag = collect_since_last_tag_on_main(main_branch)
-
+    last_tag, head = _resolve_release(main_branch)
     repo_url = config.get("repo_url")
     group_order = config.get("changelog", {}).get("group_order")
-    grouped = _group_messages(messages, group_order, repo_url)
-
-    # Get contributors
-    contributors = _get_contributors(last_tag)
+    grouped, contributors, _ = _collect_release(
+        last_tag, head or main_branch, repo_url, group_order
+    )
 
     entry = {
         "version": new_version,
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import re
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+from versioning_tool.core import _NUMERIC_BACKREF, Commit, parse_trailers
+
+# type(scope)!: description
+_HEADER = re.compile(
+    r"(?P<type>[A-Za-z0-9_-]+)(?:\((?P<scope>[^()\r\n]*)\))?(?P<bang>!)?:(?P<description>.*)"
+)
+_BREAKING = ("BREAKING CHANGE", "BREAKING-CHANGE")
+
+# Rule patterns answered from the parsed header instead of a regex scan
+_TYPE_RULE = re.compile(r"\^([A-Za-z0-9_]+)(!?):")
+_LITERAL_RULE = re.compile(r"[A-Za-z0-9 _]+")
+_CATCH_ALL = (".*", "")
+
+
+class ConventionalCommit:
+    """A commit message tokenized once into its conventional-commit fields."""
+
+    __slots__ = ("type", "scope", "bang", "description", "footers", "breaking")
+
+    def __init__(
+        self,
+        type: Optional[str],
+        scope: Optional[str],
+        bang: bool,
+        description: str,
+        footers: Sequence[Tuple[str, str]],
+    ):
+        self.type = type  # None when the subject has no conventional header
+        self.scope = scope
+        self.bang = bang  # "type!:" marker
+        self.description = description
+        self.footers = footers
+        self.breaking = bang
+        for key, _ in footers:
+            if key in _BREAKING:
+                self.breaking = True
+
+    def __repr__(self) -> str:
+        return (
+            f"ConventionalCommit(type={self.type!r}, scope={self.scope!r}, "
+            f"breaking={self.breaking}, description={self.description!r})"
+        )
+
+
+def parse_header(subject: str, footers: Sequence[Tuple[str, str]] = ()) -> ConventionalCommit:
+    """Tokenize a subject line (plus already parsed footers) into a ConventionalCommit."""
+    m = _HEADER.match(subject)
+    if m is None:
+        return ConventionalCommit(None, None, False, subject, footers)
+    type_, scope, bang, description = m.groups()
+    return ConventionalCommit(type_, scope, bang is not None, description, footers)
+
+
+@lru_cache(maxsize=4096)
+def parse_message(message: str) -> ConventionalCommit:
+    """Tokenize a full commit message (subject, blank line, body)."""
+    subject, _, body = message.partition("\n")
+    return parse_header(subject, parse_trailers(body) if body.strip() else ())
+
+
+_parsed: Dict[str, ConventionalCommit] = {}
+_PARSED_MAX = 1 << 18
+
+
+def parse_commit(commit: Commit) -> ConventionalCommit:
+    """``commit`` tokenized, memoized per SHA (commits never change)."""
+    cc = _parsed.get(commit.sha)
+    if cc is None:
+        if len(_parsed) >= _PARSED_MAX:
+            _parsed.clear()
+        footers = commit.trailers if commit.body else ()
+        cc = _parsed[commit.sha] = parse_header(commit.subject, footers)
+    return cc
+
+
+class RuleSet:
+    """
+    A list of rule regexes matched against tokenized commits.
+
+    The usual spellings are answered from the parsed fields: ``^type:`` and
+    ``^type!:`` compare the header, plain words such as ``BREAKING CHANGE`` are
+    a substring test, and ``.*`` matches everything. Any other pattern falls
+    back to a regex search of the message text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = tuple(patterns)
+        self.headers = set()  # (type, bang) pairs
+        self.literals: List[str] = []
+        self.catch_all = False
+        rest = []
+        for p in self.patterns:
+            m = _TYPE_RULE.fullmatch(p)
+            if m:
+                self.headers.add((m.group(1), bool(m.group(2))))
+            elif p in _CATCH_ALL:
+                self.catch_all = True
+            elif _LITERAL_RULE.fullmatch(p):
+                self.literals.append(p)
+            else:
+                rest.append(p)
+        self.regexes = _compile_alternation(tuple(rest)) if rest else []
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def match(self, cc: ConventionalCommit, text: str) -> bool:
+        """Whether ``cc`` (tokenized from ``text``) matches any of the patterns."""
+        if self.catch_all:
+            return True
+        if cc.scope is None and (cc.type, cc.bang) in self.headers:
+            return True
+        for lit in self.literals:
+            if lit in text:
+                return True
+        for regex in self.regexes:
+            if regex.search(text):
+                return True
+        return False
+
+
+def _compile_alternation(patterns: Tuple[str, ...]) -> List[Pattern]:
+    """Fold patterns into one regex; keep them separate if they can't be combined."""
+    # Folding renumbers capture groups, so "\1" would point into another pattern
+    alone = [re.compile(p) for p in patterns if _NUMERIC_BACKREF.search(p)]
+    rest = [p for p in patterns if not _NUMERIC_BACKREF.search(p)]
+    if not rest:
+        return alone
+    try:
+        return [re.compile("|".join(f"(?:{p})" for p in rest))] + alone
+    except re.error:
+        # e.g. a global inline flag such as "(?i)" that is only legal at the start
+        return [re.compile(p) for p in rest] + alone
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import os
 import re
+import codecs
+import atexit
+import weakref
+import shutil
 import fnmatch
 import subprocess
 
-from pathlib import Path
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from pathlib import Path
+
+from versioning_tool import trace
+from typing import Awaitable, Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple, TypeVar
 
 
 @dataclass
@@ -14,43 +24,868 @@ class GitRange:
     base: str
     head: str = "HEAD"
 
+    def spec(self) -> str:
+        """Revision range for log/rev-list; an empty base means all history of ``head``."""
+        return f"{self.base}..{self.head}" if self.base else self.head
+
+
+# "Key: value" / "Key #value" footer lines; BREAKING CHANGE may contain a space
+_TRAILER = re.compile(r"(BREAKING[ -]CHANGE|[A-Za-z0-9][A-Za-z0-9-]*)(?:: | #)(.*)")
+_BREAKING = ("BREAKING CHANGE", "BREAKING-CHANGE")
+
+
+def parse_trailers(body: str) -> List[Tuple[str, str]]:
+    """
+    ``(key, value)`` footers of a commit body: its last paragraph, if every line
+    of it is a trailer or an indented continuation of one.
+    """
+    last = body.strip().rsplit("\n\n", 1)[-1]
+    trailers: List[Tuple[str, str]] = []
+    for line in last.splitlines():
+        if line[:1].isspace() and trailers:
+            key, value = trailers[-1]
+            trailers[-1] = (key, f"{value} {line.strip()}")
+            continue
+        m = _TRAILER.fullmatch(line)
+        if m is None:
+            return []
+        trailers.append((m.group(1), m.group(2).strip()))
+    return trailers
+
+
+class Commit:
+    """
+    One commit as read by ``iter_log`` (or from the commit cache). Trailers are
+    parsed from the body on first use.
+    """
+
+    __slots__ = ("sha", "subject", "body", "author", "date", "parents", "files", "_trailers")
+
+    def __init__(
+        self,
+        sha: str,
+        subject: str,
+        body: str = "",
+        author: str = "",
+        date: str = "",
+        parents: Optional[List[str]] = None,
+        files: Optional[List[str]] = None,
+    ):
+        self.sha = sha
+        self.subject = subject
+        self.body = body
+        self.author = author
+        self.date = date  # committer date, ISO 8601
+        self.parents = parents if parents is not None else []
+        self.files = files if files is not None else []
+        self._trailers: Optional[List[Tuple[str, str]]] = None
+
+    @property
+    def trailers(self) -> List[Tuple[str, str]]:
+        if self._trailers is None:
+            self._trailers = parse_trailers(self.body) if self.body else []
+        return self._trailers
+
+    @property
+    def message(self) -> str:
+        return f"{self.subject}\n\n{self.body}" if self.body else self.subject
+
+    @property
+    def rule_text(self) -> str:
+        """The subject plus any ``BREAKING CHANGE`` footers: what bump and section rules see."""
+        if "BREAKING" not in self.body:
+            return self.subject
+        footers = [f"{k}: {v}" for k, v in self.trailers if k in _BREAKING]
+        return "\n".join([self.subject, *footers])
+
+    def __getstate__(self):
+        return {k: getattr(self, k) for k in self.__slots__ if k != "_trailers"}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Commit) and self.__getstate__() == other.__getstate__()
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        return f"Commit({self.sha[:12]!r}, {self.subject!r})"
+
+
+@dataclass
+class TagInfo:
+    name: str
+    commit: str  # peeled commit SHA
+    date: str  # creator date, ISO 8601
+    subject: str  # subject of the tagged commit
+
+
+@dataclass
+class BranchInfo:
+    name: str
+    commit: str
+    date: str  # committer date of the tip, ISO 8601
+    subject: str  # subject of the tip commit
+
+
+# objecttype/objectname describe the ref target, the "*" variants the peeled
+# object of an annotated tag (empty for lightweight tags).
+TAG_FORMAT = "%00".join(
+    [
+        "%(refname:short)",
+        "%(objecttype)",
+        "%(objectname)",
+        "%(*objecttype)",
+        "%(*objectname)",
+        "%(creatordate:iso-strict)",
+        "%(subject)",
+        "%(*subject)",
+    ]
+)
+
+BRANCH_FORMAT = "%00".join(
+    ["%(refname:short)", "%(objectname)", "%(committerdate:iso-strict)", "%(subject)"]
+)
+
+# One record per commit: RS, then US-separated fields, then the NUL-separated
+# --name-only file list that `-z` appends after the format.
+LOG_FORMAT = "%x1e%H%x1f%P%x1f%an%x1f%cI%x1f%s%x1f%b%x1f"
+
 
 def run_git(args: List[str]) -> str:
-    res = subprocess.run(["git", *args], capture_output=True, text=True, check=True)
+    with trace.span(args) as call:
+        res = subprocess.run(["git", *args], capture_output=True, text=True, check=True)
+        if call:
+            call.stdout_bytes = len(res.stdout)
     return res.stdout.strip()
 
 
+def find_git_dir() -> Path:
+    """
+    The git dir of the current worktree, found the way git does (``$GIT_DIR``, else
+    the nearest ``.git`` directory or ``gitdir:`` file) without starting a process.
+    """
+    env = os.getenv("GIT_DIR")
+    if env:
+        return Path(env).resolve()
+    here = Path.cwd().resolve()
+    for d in (here, *here.parents):
+        dotgit = d / ".git"
+        if dotgit.is_dir():
+            return dotgit
+        if dotgit.is_file():  # worktree / submodule: "gitdir: <path>"
+            target = dotgit.read_text().split(":", 1)[1].strip()
+            return (d / target).resolve()
+    raise FileNotFoundError("not a git repository")
+
+
+# Upper bound on concurrent git processes started by run_git_async, per event loop
+GIT_CONCURRENCY = int(os.getenv("VUTIL_GIT_CONCURRENCY") or 8)
+_git_slots: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+async def run_git_async(args: List[str]) -> str:
+    """
+    ``run_git`` for asyncio callers: independent queries awaited together (e.g. with
+    ``asyncio.gather``) overlap, with at most ``GIT_CONCURRENCY`` git processes alive.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    slots = _git_slots.get(loop)
+    if slots is None:
+        slots = _git_slots[loop] = asyncio.Semaphore(GIT_CONCURRENCY)
+    async with slots:
+        with trace.span(args, "async") as call:
+            proc = await asyncio.create_subprocess_exec(
+                "git", *args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+            out, err = await proc.communicate()
+            if call:
+                call.stdout_bytes = len(out)
+            if proc.returncode:
+                raise subprocess.CalledProcessError(proc.returncode, ["git", *args], out, err)
+    return out.decode().strip()
+
+
+T = TypeVar("T")
+
+
+def run_coroutine(coro: Awaitable[T]) -> T:
+    """
+    ``asyncio.run(coro)`` for sync callers. Inside a running event loop, where
+    ``asyncio.run`` fails, the coroutine gets its own loop on a worker thread.
+    """
+    import asyncio
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+class GitBackend(ABC):
+    """
+    Read-only repository queries that need no history walk. ``GitSession`` answers
+    them through git subprocesses; ``objects.NativeBackend`` reads ``.git`` directly.
+    """
+
+    @abstractmethod
+    def current_branch(self) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def resolve(self, rev: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def commit_sha(self, rev: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def commit_message(self, rev: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def commit_parents(self, rev: str) -> Optional[List[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def changed_files(self, base: str, head: str) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_tags(self, merged: Optional[str] = None, sort: str = "-creatordate") -> List[TagInfo]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_branches(self, sort: str = "-committerdate") -> List[BranchInfo]:
+        raise NotImplementedError
+
+    def commit_subject(self, rev: str) -> Optional[str]:
+        """Return the subject line of ``rev``, like ``git log -1 --pretty=%s``."""
+        message = self.commit_message(rev)
+        if message is None:
+            return None
+        # %s joins the first paragraph into a single line
+        return " ".join(message.strip().split("\n\n", 1)[0].splitlines()) if message else ""
+
+    def invalidate(self, refs: Optional[Iterable[str]] = None):
+        """Forget anything derived from ``refs`` (full names, or every ref when None)."""
+
+
+# Commands and flags whose answer depends on every ref, not just the ones named
+_ALL_REFS = {"for-each-ref", "show-ref", "describe", "name-rev", "branch", "tag"}
+_ALL_REFS_FLAGS = ("--all", "--branches", "--tags", "--remotes", "--glob", "--merged")
+_FULL_SHA = re.compile(r"[0-9a-f]{40}")
+_RANGE = re.compile(r"\.\.\.?")
+_REF_END = re.compile(r"[~^:]|@\{")
+
+
+def _ref_names(args: Iterable[str]) -> Optional[Set[str]]:
+    """
+    Ref names that git arguments (or a cat-file revision) read, or None if the answer
+    may depend on any ref. Full SHAs name immutable objects and depend on nothing.
+    """
+    names = set()
+    for arg in args:
+        if arg == "--":
+            break
+        if arg.startswith(_ALL_REFS_FLAGS) or re.search(r"@\{[^0-9]", arg):
+            return None  # @{u} / @{push} read the upstream too
+        if arg.startswith("-"):
+            continue
+        for part in _RANGE.split(arg):
+            name = _REF_END.split(part.lstrip("^"), 1)[0]
+            if name in ("", "@"):
+                names.add("HEAD")
+            elif not _FULL_SHA.fullmatch(name):
+                names.add(name)
+    return names
+
+
+def _command_ref_names(args: List[str]) -> Optional[Set[str]]:
+    return None if args[0] in _ALL_REFS else _ref_names(args[1:])
+
+
+def _ref_aliases(refs: Iterable[str]) -> Set[str]:
+    """Every name a revision could use for ``refs``: ``refs/heads/x``, ``heads/x``, ``x``."""
+    names = set()
+    for ref in refs:
+        names.add(ref)
+        if ref.startswith("refs/"):
+            short = ref[5:]
+            names.add(short)
+            if "/" in short:
+                names.add(short.split("/", 1)[1])
+            if ref.startswith("refs/remotes/") and ref.endswith("/HEAD"):
+                names.add(short.split("/")[1])  # "origin" means origin/HEAD
+    return names
+
+
+class GitSession(GitBackend):
+    """
+    Long-lived git session shared by every helper for the duration of a command.
+
+    Object lookups go through persistent ``git cat-file --batch-check`` and
+    ``git cat-file --batch`` pipes instead of forking one ``git`` per query,
+    and, when ``cache`` is set, plain ``run_git`` calls and object reads are
+    memoized for the lifetime of the session. Memo entries are indexed by the ref
+    names they were computed from, so ``invalidate`` can drop only those.
+    """
+
+    def __init__(self, cache: bool = True):
+        self.cache = cache
+        self._check: Optional[subprocess.Popen] = None
+        self._batch: Optional[subprocess.Popen] = None
+        self._runs: Dict[Tuple[str, ...], str] = {}
+        self._objects: Dict[str, Optional[Tuple[str, str, bytes]]] = {}
+        # ref name ("*": any ref) -> memo entries that depend on it
+        self._by_ref: Dict[str, Set[Tuple[str, object]]] = {}
+
+    def __enter__(self) -> "GitSession":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _spawn(mode: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "cat-file", mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    @staticmethod
+    def _ask(proc: subprocess.Popen, rev: str) -> Optional[Tuple[str, str, int]]:
+        with trace.span(proc.args[1:] + [rev], "pipe"):
+            proc.stdin.write(rev.encode() + b"\n")
+            proc.stdin.flush()
+            header = proc.stdout.readline().decode().split()
+        # "<rev> missing" / "<rev> ambiguous" are the only two-field answers
+        if len(header) != 3:
+            return None
+        sha, kind, size = header
+        return sha, kind, int(size)
+
+    def run(self, args: List[str]) -> str:
+        """Memoized ``run_git``; failures are raised and never cached."""
+        if not self.cache:
+            return run_git(args)
+        key = tuple(args)
+        if key not in self._runs:
+            self._runs[key] = run_git(args)
+            self._depend("runs", key, _command_ref_names(args))
+        return self._runs[key]
+
+    async def run_async(self, args: List[str]) -> str:
+        """``run`` through ``run_git_async``, sharing the same memo."""
+        key = tuple(args)
+        if self.cache and key in self._runs:
+            return self._runs[key]
+        out = await run_git_async(args)
+        if self.cache:
+            self._runs[key] = out
+            self._depend("runs", key, _command_ref_names(args))
+        return out
+
+    def _depend(self, memo: str, key, names: Optional[Set[str]]):
+        for name in ("*",) if names is None else names:
+            self._by_ref.setdefault(name, set()).add((memo, key))
+
+    def object_info(self, rev: str) -> Optional[Tuple[str, str]]:
+        """Resolve ``rev`` to ``(sha, type)`` through the ``--batch-check`` pipe."""
+        if not rev or "\n" in rev:
+            return None
+        if self._check is None:
+            self._check = self._spawn("--batch-check")
+        info = self._ask(self._check, rev)
+        return info[:2] if info else None
+
+    def read_object(self, rev: str) -> Optional[Tuple[str, str, bytes]]:
+        """Return ``(sha, type, raw content)`` for ``rev`` through the ``--batch`` pipe."""
+        if rev in self._objects:
+            return self._objects[rev]
+        if not rev or "\n" in rev:
+            return None
+        if self._batch is None:
+            self._batch = self._spawn("--batch")
+        info = self._ask(self._batch, rev)
+        obj = None
+        if info:
+            sha, kind, size = info
+            data = self._batch.stdout.read(size)
+            self._batch.stdout.read(1)  # trailing LF
+            obj = (sha, kind, data)
+        if self.cache:
+            self._objects[rev] = obj
+            self._depend("objects", rev, _ref_names([rev]))
+        return obj
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """Return the full SHA ``rev`` points at, or None if it does not exist."""
+        info = self.object_info(rev)
+        return info[0] if info else None
+
+    def commit_sha(self, rev: str) -> Optional[str]:
+        """Peel ``rev`` (e.g. an annotated tag) down to its commit SHA."""
+        return self.resolve(f"{rev}^{{commit}}")
+
+    def commit_message(self, rev: str) -> Optional[str]:
+        """Return the full commit message of ``rev``."""
+        obj = self.read_object(f"{rev}^{{commit}}")
+        if obj is None:
+            return None
+        _, sep, message = obj[2].partition(b"\n\n")
+        return message.decode("utf-8", errors="replace") if sep else ""
+
+    def commit_parents(self, rev: str) -> Optional[List[str]]:
+        obj = self.read_object(f"{rev}^{{commit}}")
+        if obj is None:
+            return None
+        headers = obj[2].partition(b"\n\n")[0].split(b"\n")
+        return [h[7:].decode() for h in headers if h.startswith(b"parent ")]
+
+    def current_branch(self) -> str:
+        return self.run(["rev-parse", "--abbrev-ref", "HEAD"])
+
+    def changed_files(self, base: str, head: str) -> List[str]:
+        out = self.run(["diff", "--name-only", f"{base}..{head}"])
+        return [l for l in out.splitlines() if l.strip()]
+
+    def list_tags(self, merged: Optional[str] = None, sort: str = "-creatordate") -> List[TagInfo]:
+        args = ["for-each-ref", "refs/tags", f"--sort={sort}", f"--format={TAG_FORMAT}"]
+        if merged:
+            args.append(f"--merged={merged}")
+        tags = []
+        for line in self.run(args).splitlines():
+            fields = line.split("\x00")
+            if len(fields) != 8:
+                continue
+            name, kind, sha, peeled_kind, peeled_sha, date, subject, peeled_subject = fields
+            if peeled_kind:
+                kind, sha, subject = peeled_kind, peeled_sha, peeled_subject
+            if kind == "commit":
+                tags.append(TagInfo(name=name, commit=sha, date=date, subject=subject))
+        return tags
+
+    def list_branches(self, sort: str = "-committerdate") -> List[BranchInfo]:
+        out = self.run(
+            ["for-each-ref", "refs/heads", f"--sort={sort}", f"--format={BRANCH_FORMAT}"]
+        )
+        branches = []
+        for line in out.splitlines():
+            fields = line.split("\x00")
+            if len(fields) == 4:
+                name, sha, date, subject = fields
+                branches.append(BranchInfo(name=name, commit=sha, date=date, subject=subject))
+        return branches
+
+    def invalidate(self, refs: Optional[Iterable[str]] = None):
+        """
+        Forget memoized answers that read ``refs`` (full ref names such as
+        ``refs/heads/main`` or ``HEAD``; all of them when None) but keep the pipes running.
+        """
+        if refs is None:
+            self._runs.clear()
+            self._objects.clear()
+            self._by_ref.clear()
+            return
+        for name in _ref_aliases(refs) | {"*"}:
+            for memo, key in self._by_ref.pop(name, ()):
+                getattr(self, "_" + memo).pop(key, None)
+
+    def close(self):
+        for proc in (self._check, self._batch):
+            if proc is None:
+                continue
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=5)
+            except Exception:
+                proc.kill()
+        self._check = self._batch = None
+        self._runs.clear()
+        self._objects.clear()
+
+
+_session: Optional[GitSession] = None
+
+
+def get_session() -> GitSession:
+    """Return the active git session, starting an uncached process-wide one if needed."""
+    global _session
+    if _session is None:
+        _session = GitSession(cache=False)
+        atexit.register(_session.close)
+    return _session
+
+
+@contextmanager
+def git_session() -> Iterator[GitSession]:
+    """Scope a fresh git session to a single command."""
+    global _session
+    previous, _session = _session, GitSession()
+    try:
+        yield _session
+    finally:
+        _session.close()
+        _session = previous
+
+
+BACKEND_ENV = "VUTIL_GIT_BACKEND"  # "subprocess" (default) or "native"
+
+# What the native backend answers without a git binary; history walks always need git
+NATIVE_SCOPE = "current branch, tags, branches, commit messages and parents, changed files"
+
+_backend: Optional[GitBackend] = None
+_native: Optional[GitBackend] = None
+
+
+def set_backend(backend: Optional[GitBackend]):
+    """Route read-only lookups through ``backend``; None restores the default choice."""
+    global _backend
+    _backend = backend
+
+
+@lru_cache(maxsize=None)
+def _have_git() -> bool:
+    return shutil.which("git") is not None
+
+
+def get_backend() -> GitBackend:
+    """
+    Return the backend for read-only lookups: an explicit ``set_backend`` choice,
+    else ``VUTIL_GIT_BACKEND``, else the git session, falling back to the native
+    ``.git`` reader when no ``git`` binary is installed.
+    """
+    global _native
+    if _backend is not None:
+        return _backend
+    choice = os.getenv(BACKEND_ENV, "").lower()
+    if choice == "native" or (choice != "subprocess" and not _have_git()):
+        if _native is None:
+            from versioning_tool.objects import NativeBackend
+
+            _native = NativeBackend()
+        return _native
+    return get_session()
+
+
 def current_branch() -> str:
-    return run_git(["rev-parse", "--abbrev-ref", "HEAD"])
+    return get_backend().current_branch()
 
 
 def last_tag_on_branch(branch: str) -> Optional[str]:
     try:
         # most recent tag reachable from this branch
-        return run_git(["describe", "--tags", "--abbrev=0", branch])
+        return get_session().run(["describe", "--tags", "--abbrev=0", branch])
+    except subprocess.CalledProcessError:
+        return None
+
+
+async def last_tag_on_branch_async(branch: str) -> Optional[str]:
+    try:
+        return await get_session().run_async(["describe", "--tags", "--abbrev=0", branch])
     except subprocess.CalledProcessError:
         return None
 
 
 def changed_files(gr: GitRange) -> List[str]:
-    out = run_git(["diff", "--name-only", f"{gr.base}..{gr.head}"])
-    return [l for l in out.splitlines() if l.strip()]
+    return get_backend().changed_files(gr.base, gr.head)
 
 
 def commit_messages(gr: GitRange) -> List[str]:
-    out = run_git(["log", f"{gr.base}..{gr.head}", "--pretty=format:%s"])
+    out = get_session().run(["log", f"{gr.base}..{gr.head}", "--pretty=format:%s"])
     return [l for l in out.splitlines() if l.strip()]
 
 
+def list_tags(merged: Optional[str] = None, sort: str = "-creatordate") -> List[TagInfo]:
+    """
+    Resolve every tag (optionally only those reachable from ``merged``) to its
+    commit, creator date and commit subject with a single ``for-each-ref`` call.
+    Tags that do not point at a commit are skipped.
+    """
+    return get_backend().list_tags(merged, sort)
+
+
+def list_branches(sort: str = "-committerdate") -> List[BranchInfo]:
+    """Every local branch with its tip SHA, date and subject, from one ``for-each-ref`` call."""
+    return get_backend().list_branches(sort)
+
+
+def _parse_log_record(raw: str) -> Commit:
+    head, _, tail = raw.rpartition("\x1f")
+    sha, parents, author, date, subject, body = head.split("\x1f", 5)
+    return Commit(
+        sha=sha,
+        subject=subject,
+        body=body.strip(),
+        author=author,
+        date=date,
+        parents=parents.split(),
+        files=[f for f in tail.lstrip("\x00").lstrip("\n").split("\x00") if f],
+    )
+
+
+def iter_log(args: List[str], chunk_size: int = 1 << 16) -> Iterator[Commit]:
+    """
+    Stream ``git log -z --name-only`` output as Commits without buffering
+    the whole history in memory.
+    """
+    argv = ["log", "-z", "--name-only", f"--format={LOG_FORMAT}", *args]
+    proc = subprocess.Popen(["git", *argv], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    # The span stays open while the consumer iterates, so it covers the whole walk
+    with trace.span(argv, "stream") as call:
+        yield from _read_log(proc, decoder, chunk_size, call)
+
+
+def _read_log(proc: subprocess.Popen, decoder, chunk_size: int, call) -> Iterator[Commit]:
+    buf = ""
+    drained = False
+    try:
+        while True:
+            chunk = proc.stdout.read(chunk_size)
+            if not chunk:
+                drained = True
+                break
+            if call:
+                call.stdout_bytes += len(chunk)
+            buf += decoder.decode(chunk)
+            *records, buf = buf.split("\x1e")
+            for raw in records:
+                if raw:
+                    yield _parse_log_record(raw)
+        if buf:
+            yield _parse_log_record(buf)
+    finally:
+        if not drained:
+            # The consumer stopped early (break, close() or an error): git would
+            # only die of SIGPIPE, which is not a failure worth reporting
+            proc.terminate()
+        proc.stdout.close()
+        stderr = proc.stderr.read()
+        proc.stderr.close()
+        if proc.wait() != 0 and drained:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=stderr)
+
+
+def iter_commits(gr: GitRange) -> Iterator[Commit]:
+    """Single history walk over ``gr`` yielding message and touched files per commit."""
+    return iter_log([gr.spec()])
+
+
+_CASE_INSENSITIVE = os.path.normcase("A") == "a"  # mirror fnmatch.fnmatch on this platform
+_GLOB_META = frozenset("*?[")
+
+
+def _glob_to_regex(pat: str) -> str:
+    """
+    Translate a path glob to a regex body.
+
+    ``*`` keeps fnmatch's meaning (it may cross ``/``) so existing ignore lists
+    behave as before; ``**/`` additionally matches zero or more whole
+    directories and a trailing ``/**`` everything below a directory.
+    """
+    i, n, out = 0, len(pat), []
+    while i < n:
+        c = pat[i]
+        if pat.startswith("**/", i) and (i == 0 or pat[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif c == "*":
+            while i < n and pat[i] == "*":
+                i += 1
+            out.append(".*")
+        elif c == "?":
+            out.append(".")
+            i += 1
+        elif c == "[":
+            j = i + 1
+            if j < n and pat[j] == "!":
+                j += 1
+            if j < n and pat[j] == "]":
+                j += 1
+            while j < n and pat[j] != "]":
+                j += 1
+            if j >= n:
+                out.append("\\[")
+                i += 1
+                continue
+            out.append(_glob_class(pat[i + 1 : j]))
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def _glob_class(body: str) -> str:
+    """
+    Regex for the glob class ``[body]``, read the way fnmatch reads it: reversed
+    ranges match nothing, and characters regex sets treat specially (``\\``,
+    ``[``, ``]``, ``&``, ``~``, ``|`` and hyphens outside ranges) are literal.
+    """
+    # Split around the hyphens that form ranges; a leading or trailing one is literal
+    chunks, start = [], 0
+    k = 2 if body.startswith("!") else 1
+    while True:
+        k = body.find("-", k)
+        if k < 0:
+            break
+        chunks.append(body[start:k])
+        start, k = k + 1, k + 3
+    if body[start:] or not chunks:
+        chunks.append(body[start:])
+    else:
+        chunks[-1] += "-"
+    for k in range(len(chunks) - 1, 0, -1):  # drop reversed ranges such as "z-a"
+        if chunks[k - 1][-1] > chunks[k][0]:
+            chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+            del chunks[k]
+    stuff = "-".join(c.replace("\\", "\\\\").replace("-", "\\-") for c in chunks)
+    if not stuff:
+        return "(?!)"
+    if stuff == "!":
+        return "."
+    # like fnmatch, a "!" left first (even by a dropped range) negates the class
+    negate = stuff.startswith("!")
+    stuff = re.sub(r"([\[\]&~|^])", r"\\\1", stuff[1:] if negate else stuff)
+    return f"[^{stuff}]" if negate else f"[{stuff}]"
+
+
+class FileMatcher:
+    """
+    Ignore-glob matcher compiled once for a whole pattern list.
+
+    Literal paths, ``*<suffix>`` and ``<prefix>*`` / ``<prefix>/**`` patterns are
+    answered with set and ``str.startswith``/``endswith`` lookups; everything
+    else is folded into a single anchored alternation. Each glob is compiled on
+    its own first, so one that ``re`` rejects falls back to ``fnmatch`` alone
+    instead of breaking every match.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        exact, prefixes, suffixes, regexes, globs = set(), [], [], [], []
+        for pat in patterns:
+            if _CASE_INSENSITIVE:
+                pat = pat.lower()
+            body = pat[:-3] if pat.endswith("/**") else pat
+            if not _GLOB_META & set(pat):
+                exact.add(pat)
+            elif pat.endswith("/**") and not _GLOB_META & set(body):
+                prefixes.append(body + "/")
+            elif pat.endswith("*") and not _GLOB_META & set(pat[:-1]):
+                prefixes.append(pat[:-1])
+            elif pat.startswith("*") and "**" not in pat and not _GLOB_META & set(pat[1:]):
+                suffixes.append(pat[1:])
+            else:
+                regex = _glob_to_regex(pat)
+                try:
+                    re.compile(regex, re.DOTALL)
+                except re.error:
+                    globs.append(pat)
+                else:
+                    regexes.append(regex)
+        self.exact = frozenset(exact)
+        self.prefixes = tuple(prefixes)
+        self.suffixes = tuple(suffixes)
+        self.regex = (
+            re.compile("|".join(f"(?:{r})" for r in regexes), re.DOTALL) if regexes else None
+        )
+        self.globs: List[str] = globs  # matched with fnmatch
+
+    def matches(self, path: str) -> bool:
+        if _CASE_INSENSITIVE:
+            path = path.lower()
+        return (
+            path in self.exact
+            or path.startswith(self.prefixes)
+            or path.endswith(self.suffixes)
+            or (self.regex is not None and self.regex.fullmatch(path) is not None)
+            or any(fnmatch.fnmatchcase(path, g) for g in self.globs)
+        )
+
+    def filter(self, paths: Iterable[str]) -> List[str]:
+        """Return the paths that match none of the patterns."""
+        return [p for p in paths if not self.matches(p)]
+
+
+@lru_cache(maxsize=32)
+def compile_file_matcher(patterns: Tuple[str, ...]) -> FileMatcher:
+    return FileMatcher(patterns)
+
+
 def filter_files(paths: Iterable[str], patterns: Iterable[str]) -> List[str]:
-    keep = []
-    for p in paths:
-        if any(fnmatch.fnmatch(p, pat) for pat in patterns):
-            continue
-        keep.append(p)
-    return keep
+    return compile_file_matcher(tuple(patterns)).filter(paths)
+
+
+_NUMERIC_BACKREF = re.compile(r"\\[1-9]")
+
+
+class CommitFilter:
+    """
+    Commit-ignore regexes folded into one compiled alternation, one named group
+    per rule, so a single ``search`` both decides and explains each drop.
+
+    Rules that can't share an alternation (numeric backreferences, mid-pattern
+    global flags) make the filter fall back to searching them one by one.
+    """
+
+    def __init__(self, regexes: Iterable[str]):
+        self.rules = list(regexes)
+        self.regex: Optional[Pattern] = None
+        self._separate: List[Pattern] = []
+        if not self.rules:
+            return
+        if not any(_NUMERIC_BACKREF.search(r) for r in self.rules):
+            try:
+                self.regex = re.compile(
+                    "|".join(f"(?P<r{i}>{r})" for i, r in enumerate(self.rules))
+                )
+                return
+            except re.error:
+                pass
+        self._separate = [re.compile(r) for r in self.rules]
+
+    def match(self, msg: str) -> Optional[str]:
+        """Return the rule that drops ``msg``, or None if it is kept."""
+        if self.regex is not None:
+            m = self.regex.search(msg)
+            # the outer named group closes last, so lastgroup names the rule
+            return self.rules[int(m.lastgroup[1:])] if m else None
+        for rule, regex in zip(self.rules, self._separate):
+            if regex.search(msg):
+                return rule
+        return None
+
+    def explain(self, msgs: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Stream ``(message, dropping rule or None)`` pairs."""
+        for m in msgs:
+            yield m, self.match(m)
+
+    def iter_kept(self, msgs: Iterable[str]) -> Iterator[str]:
+        """Stream the messages no rule drops, without building intermediate lists."""
+        if self.regex is None and not self._separate:
+            yield from msgs
+            return
+        for m in msgs:
+            if self.match(m) is None:
+                yield m
+
+
+@lru_cache(maxsize=32)
+def compile_commit_filter(regexes: Tuple[str, ...]) -> CommitFilter:
+    return CommitFilter(regexes)
 
 
 def filter_commits(msgs: Iterable[str], regexes: Iterable[str]) -> List[str]:
-    regs = [re.compile(r) for r in regexes]
-    return [m for m in msgs if not any(r.search(m) for r in regs)]
+    return list(compile_commit_filter(tuple(regexes)).iter_kept(msgs))
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import os
+import json
+import socket
+import threading
+import socketserver
+
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+SOCKET_NAME = "daemon.sock"
+
+
+def socket_path() -> Optional[Path]:
+    """
+    Return the daemon socket of the current worktree, or None if unsupported.
+
+    The socket lives under the per-worktree git dir rather than the shared
+    commit cache: linked worktrees have their own HEAD and checkout, so each
+    needs its own daemon. Found without running git, since every client asks.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    from versioning_tool.cache import CACHE_DIRNAME
+    from versioning_tool.core import find_git_dir
+
+    try:
+        return find_git_dir() / CACHE_DIRNAME / SOCKET_NAME
+    except OSError:
+        return None
+
+
+def _send(path: Path, payload: dict, timeout: float) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline() or b"{}")
+
+
+def request(cmd: str, timeout: float = 30.0) -> Optional[str]:
+    """
+    Ask a running daemon to answer ``cmd``.
+
+    Returns None when no daemon is reachable (or it failed), so callers can fall
+    back to computing the answer in-process. ``VUTIL_NO_DAEMON`` skips the daemon.
+    """
+    if os.getenv("VUTIL_NO_DAEMON"):
+        return None
+    path = socket_path()
+    if path is None or not path.exists():
+        return None
+    try:
+        resp = _send(path, {"cmd": cmd}, timeout)
+    except (OSError, ValueError):
+        return None
+    return resp.get("output") if resp.get("ok") else None
+
+
+def stop(timeout: float = 5.0) -> bool:
+    """Ask the daemon to shut down; returns False if none was running."""
+    path = socket_path()
+    if path is None or not path.exists():
+        return False
+    try:
+        return bool(_send(path, {"cmd": "shutdown"}, timeout).get("ok"))
+    except (OSError, ValueError):
+        return False
+
+
+class _Watcher:
+    """Polls mtimes of HEAD, refs and the config file to tell what changed between requests."""
+
+    def __init__(self, git_dir: Path, common_dir: Path, config: Path):
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self.config = config
+        self.refs = self._refs_snapshot()
+        self.packed_mtime = self._mtime(common_dir / "packed-refs")
+        self.packed = self._packed_refs()
+        self.config_mtime = self._mtime(config)
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _refs_snapshot(self) -> Dict[str, Optional[int]]:
+        """Loose ref name -> mtime, plus this worktree's ``HEAD``."""
+        snap = {"HEAD": self._mtime(self.git_dir / "HEAD")}
+        for root, _, files in os.walk(self.common_dir / "refs"):
+            for name in files:
+                path = Path(root) / name
+                snap[path.relative_to(self.common_dir).as_posix()] = self._mtime(path)
+        return snap
+
+    def _packed_refs(self) -> Dict[str, str]:
+        try:
+            lines = (self.common_dir / "packed-refs").read_text().splitlines()
+        except OSError:
+            return {}
+        # "^<sha>" peel lines belong to the tag above them and move with it
+        return {l[41:]: l[:40] for l in lines if l and l[0] not in "#^"}
+
+    @staticmethod
+    def _diff(old: dict, new: dict) -> Set[str]:
+        return {k for k in old.keys() | new.keys() if old.get(k) != new.get(k)}
+
+    def changed_refs(self) -> Set[str]:
+        """
+        Full names of the refs created, moved or deleted since the last call. ``HEAD``
+        is included when it was switched or the branch it points at moved.
+        """
+        snap = self._refs_snapshot()
+        changed, self.refs = self._diff(self.refs, snap), snap
+        mtime = self._mtime(self.common_dir / "packed-refs")
+        if mtime != self.packed_mtime:
+            packed = self._packed_refs()
+            changed |= self._diff(self.packed, packed)
+            self.packed, self.packed_mtime = packed, mtime
+        if changed and "HEAD" not in changed:
+            try:
+                head = (self.git_dir / "HEAD").read_text().strip()
+            except OSError:
+                head = ""
+            if head.startswith("ref: ") and head[5:] in changed:
+                changed.add("HEAD")
+        return changed
+
+    def config_changed(self) -> bool:
+        mtime = self._mtime(self.config)
+        changed, self.config_mtime = mtime != self.config_mtime, mtime
+        return changed
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server: VutilDaemon = self.server  # type: ignore[assignment]
+        try:
+            cmd = json.loads(self.rfile.readline() or b"{}").get("cmd")
+            if cmd == "shutdown":
+                resp = {"ok": True}
+                threading.Thread(target=server.shutdown, daemon=True).start()
+            elif cmd == "ping":
+                resp = {"ok": True, "output": "pong"}
+            else:
+                resp = {"ok": True, "output": server.answer(cmd)}
+        except Exception as e:
+            resp = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(resp).encode() + b"\n")
+
+
+class VutilDaemon(socketserver.UnixStreamServer):
+    """
+    Keeps the parsed config, compiled rules, commit cache and a git session warm
+    between requests. Requests are served one at a time since they share the
+    session's cat-file pipes.
+    """
+
+    def __init__(self, path: Path, session, watcher: _Watcher, config_path: Path):
+        super().__init__(str(path), _Handler)
+        self.session = session
+        self.watcher = watcher
+        self.config_path = config_path
+        self.cfg = self._load_cfg()
+
+    def _load_cfg(self) -> dict:
+        from versioning_tool.version_manager import load_cfg
+
+        return load_cfg(self.config_path)
+
+    def answer(self, cmd: str) -> str:
+        from versioning_tool import reachability
+        from versioning_tool.core import get_backend
+        from versioning_tool.version_manager import QUERIES
+
+        if cmd not in QUERIES:
+            raise ValueError(f"unknown command {cmd!r}")
+        changed = self.watcher.changed_refs()
+        if changed:
+            # Only answers read through the moved refs go; anything keyed by SHA
+            # (the commit cache, parents, generations) stays valid
+            self.session.invalidate(changed)
+            get_backend().invalidate(changed)
+            reachability.forget_names()
+        if self.watcher.config_changed():
+            self.cfg = self._load_cfg()
+        return QUERIES[cmd](self.cfg)
+
+
+def serve(path: Optional[Path] = None):
+    """Run the daemon for the current repository in the foreground."""
+    from versioning_tool.cache import open_cache
+    from versioning_tool.config import VERSIONING_CONFIG
+    from versioning_tool.core import git_session, run_git
+
+    path = path or socket_path()
+    if path is None:
+        raise RuntimeError("Unix domain sockets are not available on this platform")
+    if path.exists():
+        try:
+            _send(path, {"cmd": "ping"}, 1.0)
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        except (OSError, ValueError):
+            path.unlink()  # stale socket from a crashed daemon
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    watcher = _Watcher(
+        Path(run_git(["rev-parse", "--git-dir"])).resolve(),
+        Path(run_git(["rev-parse", "--git-common-dir"])).resolve(),
+        VERSIONING_CONFIG,
+    )
+    open_cache()  # warm the commit cache connection
+    with git_session() as session:
+        server = VutilDaemon(path, session, watcher, VERSIONING_CONFIG)
+        print(f"vutil daemon listening on {path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            path.unlink(missing_ok=True)
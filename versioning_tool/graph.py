@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+
 from pathlib import Path
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional
-from versioning_tool.core import run_git
+from versioning_tool.core import (
+    BranchInfo,
+    TagInfo,
+    run_git,
+    get_session,
+    list_branches,
+    list_tags,
+    run_coroutine,
+)
+from versioning_tool.reachability import is_ancestor, reachability
 
 
 def _short_msg(msg: str, length: int = 25) -> str:
@@ -13,23 +25,18 @@ def _short_msg(msg: str, length: int = 25) -> str:
 
 def _get_tag_commit_map(tags: List[str]) -> Dict[str, str]:
     """Get mapping of tags to their commit SHAs."""
-    tag_commit_map = {}
-    for tag in tags:
-        try:
-            commit_sha = run_git(["rev-list", "-n", "1", tag]).strip()
-            tag_commit_map[tag] = commit_sha
-        except Exception:
-            continue
-    return tag_commit_map
+    resolved = {t.name: t.commit for t in list_tags()}
+    return {tag: resolved[tag] for tag in tags if tag in resolved}
 
 
 def _get_merge_commits(branch: str = "main") -> Dict[str, List[str]]:
     """Get merge commits and their parent branches - works locally."""
     merge_commits = {}
+    session = get_session()
 
     try:
         # Get merge commits from local branch
-        log_output = run_git(
+        log_output = session.run(
             [
                 "log",
                 branch,
@@ -57,33 +64,82 @@ def _get_merge_commits(branch: str = "main") -> Dict[str, List[str]]:
     return merge_commits
 
 
-def _get_branch_names() -> List[str]:
-    """Get all local branch names."""
+async def _get_branches_async() -> List[BranchInfo]:
+    """Local branches with their tip subjects, most recently committed first."""
+    return await asyncio.to_thread(list_branches)
+
+
+async def _get_tags_async(main_branch: str) -> List[TagInfo]:
+    # Tags reachable from main branch, already peeled and with subjects
     try:
-        branches = run_git(["branch", "--format=%(refname:short)"]).splitlines()
-        return [b.strip() for b in branches if b.strip()]
+        return await asyncio.to_thread(list_tags, main_branch)
     except Exception:
-        return ["main"]
+        # Fallback: get all tags
+        return await asyncio.to_thread(list_tags)
+
+
+async def _get_recent_commits_async(main_branch: str, max_commits: int) -> List[str]:
+    out = await get_session().run_async(
+        ["log", main_branch, "--pretty=format:%h|%s", "--max-count", str(max_commits), "--reverse"]
+    )
+    return out.splitlines()
+
+
+@dataclass
+class GraphData:
+    """What the graph generators read from git, collected up front."""
+
+    tags: List[TagInfo] = field(default_factory=list)
+    branches: List[BranchInfo] = field(default_factory=list)
+    commits: List[str] = field(default_factory=list)  # "hash|subject" on main, oldest first
+    error: Optional[Exception] = None  # failure of the graph-specific queries
+
+
+async def collect_graph_data_async(
+    main_branch: str = "main", graph_type: str = "simple", max_items: int = 20
+) -> GraphData:
+    """
+    Run the independent git queries a graph type needs concurrently: tags, branches
+    (tips and subjects in a single ``for-each-ref``) and recent commits.
+    """
+
+    async def branches() -> List[BranchInfo]:
+        return await _get_branches_async() if graph_type == "branch" else []
+
+    async def commits() -> List[str]:
+        if graph_type != "commit":
+            return []
+        return await _get_recent_commits_async(main_branch, max_items)
+
+    data = GraphData()
+    results = await asyncio.gather(
+        _get_tags_async(main_branch), branches(), commits(), return_exceptions=True
+    )
+    data.tags = results[0] if isinstance(results[0], list) else []
+    for result in results[1:]:
+        if isinstance(result, Exception):
+            data.error = result
+    if data.error is None:
+        data.branches, data.commits = results[1], results[2]
+    return data
+
+
+def collect_graph_data(
+    main_branch: str = "main", graph_type: str = "simple", max_items: int = 20
+) -> GraphData:
+    return run_coroutine(collect_graph_data_async(main_branch, graph_type, max_items))
 
 
 def _is_ancestor(commit1: str, commit2: str) -> bool:
-    """Check if commit1 is an ancestor of commit2."""
-    try:
-        result = run_git(["merge-base", "--is-ancestor", commit1, commit2])
-        return True
-    except Exception:
-        return False
+    """Check if commit1 is an ancestor of commit2 (False if either does not exist)."""
+    return is_ancestor(commit1, commit2)
 
 
-def generate_simple_release_graph(main_branch: str = "main", max_tags: int = 10) -> str:
+def generate_simple_release_graph(
+    main_branch: str = "main", max_tags: int = 10, data: Optional[GraphData] = None
+) -> str:
     """Simple and reliable graph showing tags on main branch."""
-
-    # Get tags reachable from main branch
-    try:
-        tags = run_git(["tag", "--merged", main_branch, "--sort=-creatordate"]).splitlines()
-    except Exception:
-        # Fallback: get all tags
-        tags = run_git(["tag", "--sort=-creatordate"]).splitlines()
+    tags = (data or collect_graph_data(main_branch, "simple")).tags
 
     if not tags:
         return '```mermaid\ngitGraph\n    commit id: "initial"\n```'
@@ -98,74 +154,75 @@ def generate_simple_release_graph(main_branch: str = "main", max_tags: int = 10)
 
     # Add each tag as a commit on main
     for i, tag in enumerate(recent_tags):
-        try:
-            # Get the actual commit message for the tag
-            commit_msg = run_git(["log", "-1", "--pretty=format:%s", tag])
-            short_msg = _short_msg(commit_msg, 20)
-            graph_lines.append(f'    commit id: "v{tag} {short_msg}" tag: "{tag}"')
-        except Exception:
-            # Fallback: just use tag name
-            graph_lines.append(f'    commit id: "v{tag}" tag: "{tag}"')
+        short_msg = _short_msg(tag.subject, 20)
+        graph_lines.append(f'    commit id: "v{tag.name} {short_msg}" tag: "{tag.name}"')
 
     graph_lines.append("```")
     return "\n".join(graph_lines)
 
 
-def generate_branch_based_graph(main_branch: str = "main", max_items: int = 15) -> str:
+def generate_branch_based_graph(
+    main_branch: str = "main",
+    max_items: int = 15,
+    data: Optional[GraphData] = None,
+    max_branches: Optional[int] = None,
+) -> str:
     """Graph based on branch structure rather than merge commits."""
+    data = data or collect_graph_data(main_branch, "branch", max_items)
 
     graph_lines = ["```mermaid", "gitGraph"]
     graph_lines.append('    commit id: "initial"')
 
     # Get recent branches (excluding main)
     try:
-        branches = _get_branch_names()
-        feature_branches = [b for b in branches if b != main_branch and not b.startswith("origin/")]
-
-        # Limit to recent branches
-        feature_branches = feature_branches[:5]  # Max 5 branches for readability
-
-        for i, branch in enumerate(feature_branches):
-            try:
-                # Get last commit message on branch
-                commit_msg = run_git(["log", "-1", "--pretty=format:%s", branch])
-                short_msg = _short_msg(commit_msg, 15)
-
-                graph_lines.append(f"    branch {branch}")
-                graph_lines.append(f"    checkout {branch}")
-                graph_lines.append(f'    commit id: "{short_msg}"')
-                graph_lines.append(f"    checkout {main_branch}")
+        if data.error is not None:
+            raise data.error
+        feature_branches = [
+            b for b in data.branches if b.name != main_branch and not b.name.startswith("origin/")
+        ]
+
+        # Optionally limit to the most recently committed branches
+        if max_branches is not None:
+            feature_branches = feature_branches[:max_branches]
+
+        merged_tips = reachability().ancestors_among(
+            (b.commit for b in feature_branches), main_branch
+        )
+        merged = {b.name for b in feature_branches if b.commit in merged_tips}
+        for i, info in enumerate(feature_branches):
+            branch = info.name
+            short_msg = _short_msg(info.subject, 15)
+
+            graph_lines.append(f"    branch {branch}")
+            graph_lines.append(f"    checkout {branch}")
+            graph_lines.append(f'    commit id: "{short_msg}"')
+            graph_lines.append(f"    checkout {main_branch}")
+            if branch in merged:
                 graph_lines.append(f'    merge {branch} id: "merge-{i + 1}"')
-            except Exception:
-                continue
 
     except Exception as e:
         print(f"Warning: Could not generate branch graph: {e}")
         # Fallback to simple graph
-        return generate_simple_release_graph(main_branch, max_items)
+        return generate_simple_release_graph(main_branch, max_items, data)
 
     graph_lines.append("```")
     return "\n".join(graph_lines)
 
 
-def generate_commit_based_graph(main_branch: str = "main", max_commits: int = 20) -> str:
+def generate_commit_based_graph(
+    main_branch: str = "main", max_commits: int = 20, data: Optional[GraphData] = None
+) -> str:
     """Graph based on recent commits with branch-like structure."""
+    data = data or collect_graph_data(main_branch, "commit", max_commits)
 
     graph_lines = ["```mermaid", "gitGraph"]
     graph_lines.append('    commit id: "initial"')
 
     try:
-        # Get recent commits
-        commits = run_git(
-            [
-                "log",
-                main_branch,
-                "--pretty=format:%h|%s",
-                "--max-count",
-                str(max_commits),
-                "--reverse",
-            ]
-        ).splitlines()
+        if data.error is not None:
+            raise data.error
+        # Recent commits
+        commits = data.commits
 
         # Group commits into "features"
         features = []
@@ -201,7 +258,7 @@ def generate_commit_based_graph(main_branch: str = "main", max_commits: int = 20
 
     except Exception as e:
         print(f"Warning: Could not generate commit graph: {e}")
-        return generate_simple_release_graph(main_branch, max_commits)
+        return generate_simple_release_graph(main_branch, max_commits, data)
 
     graph_lines.append("```")
     return "\n".join(graph_lines)
@@ -258,11 +315,14 @@ def get_graph_type_choice() -> str:
 
 
 def graph_for_main(
-    main_branch: str = "main", max_items: int = 12, graph_type: str = "simple"
+    main_branch: str = "main",
+    max_items: int = 12,
+    graph_type: str = "simple",
+    max_branches: Optional[int] = None,
 ) -> str:
     """Generate appropriate graph based on type choice."""
     if graph_type == "branch":
-        return generate_branch_based_graph(main_branch, max_items)
+        return generate_branch_based_graph(main_branch, max_items, max_branches=max_branches)
     elif graph_type == "commit":
         return generate_commit_based_graph(main_branch, max_items)
     else:
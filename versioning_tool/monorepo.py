@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import fnmatch
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Generic, List, Optional, TypeVar
+
+from versioning_tool.core import GitRange, current_branch, get_session
+from versioning_tool.cache import commits_in_range
+
+try:
+    import tomllib
+except Exception:
+    import tomli as tomllib  # type: ignore
+
+T = TypeVar("T")
+
+_VALUE = "\x00"  # trie key holding the value of the node; can't occur in a path segment
+
+
+@dataclass
+class Package:
+    name: str
+    path: str  # package root relative to the repo root, "" for the root package
+    version: str
+
+
+class PathTrie(Generic[T]):
+    """Maps repository paths to the value of their deepest registered directory prefix."""
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def insert(self, prefix: str, value: T):
+        node = self.root
+        for part in filter(None, prefix.split("/")):
+            node = node.setdefault(part, {})
+        node[_VALUE] = value
+
+    def lookup(self, path: str) -> Optional[T]:
+        node = self.root
+        found = node.get(_VALUE)
+        for part in path.split("/")[:-1]:  # the last segment is the file name
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(_VALUE, found)
+        return found
+
+
+def discover_packages(head: str = "HEAD", mono_cfg: Optional[dict] = None) -> List[Package]:
+    """
+    Find every ``pyproject.toml`` with a static ``[project].version`` in the tree of
+    ``head``. ``monorepo.packages`` / ``monorepo.exclude`` globs filter package roots.
+    """
+    mono_cfg = mono_cfg or {}
+    include = mono_cfg.get("packages") or ["*"]
+    exclude = mono_cfg.get("exclude") or []
+
+    session = get_session()
+    names = session.run(["ls-tree", "-r", "-z", "--name-only", head]).split("\x00")
+    packages = []
+    for name in names:
+        if name != "pyproject.toml" and not name.endswith("/pyproject.toml"):
+            continue
+        root = name[: -len("pyproject.toml")].rstrip("/")
+        if not any(fnmatch.fnmatch(root or ".", pat) for pat in include):
+            continue
+        if any(fnmatch.fnmatch(root or ".", pat) for pat in exclude):
+            continue
+        obj = session.read_object(f"{head}:{name}")
+        if obj is None:
+            continue
+        try:
+            project = tomllib.loads(obj[2].decode("utf-8")).get("project", {})
+        except (UnicodeDecodeError, tomllib.TOMLDecodeError):
+            continue
+        if "version" not in project:
+            continue  # dynamic versions are managed elsewhere
+        packages.append(
+            Package(name=project.get("name") or root or ".", path=root, version=project["version"])
+        )
+    return packages
+
+
+def plan_packages(cfg: dict, base: str, head: str = "HEAD") -> dict:
+    """
+    Compute every package's bump from a single walk of ``base..head``.
+
+    Each touched file is attributed to the package with the deepest root above
+    it; packages with no commits in the range are reported with bump "none".
+    """
+    from versioning_tool.version_manager import decide_from_commits
+
+    packages = discover_packages(head, cfg.get("monorepo", {}))
+    trie: PathTrie[Package] = PathTrie()
+    for pkg in packages:
+        trie.insert(pkg.path, pkg)
+
+    files: Dict[str, List[str]] = defaultdict(list)
+    commits: Dict[str, list] = defaultdict(list)
+    for commit in commits_in_range(GitRange(base=base, head=head)):
+        touched = set()
+        for f in commit.files:
+            pkg = trie.lookup(f)
+            if pkg is not None:
+                files[pkg.path].append(f)
+                touched.add(pkg.path)
+        for path in touched:
+            commits[path].append(commit)
+
+    branch = current_branch() if head == "HEAD" else head
+    plan = []
+    for pkg in packages:
+        if not commits[pkg.path]:
+            suggested, reason, bump = pkg.version, "no changes", "none"
+        else:
+            suggested, reason, bump = decide_from_commits(
+                cfg, branch, pkg.version, commits[pkg.path], list(dict.fromkeys(files[pkg.path]))
+            )
+        plan.append(
+            {
+                "name": pkg.name,
+                "path": pkg.path or ".",
+                "current": pkg.version,
+                "suggested": suggested,
+                "bump": bump,
+                "reason": reason,
+                "commits": len(commits[pkg.path]),
+            }
+        )
+    return {"branch": branch, "base": base, "head": head, "packages": plan}
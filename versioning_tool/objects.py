@@ -0,0 +1,736 @@
+from __future__ import annotations
+
+import os
+import re
+import mmap
+import zlib
+import struct
+
+from pathlib import Path
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from versioning_tool.core import BranchInfo, GitBackend, TagInfo, find_git_dir
+
+# Pack entry types (gitformat-pack)
+_OBJ_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+_OFS_DELTA = 6
+_REF_DELTA = 7
+
+_GRAPH_NO_PARENT = 0x70000000
+_GRAPH_EDGE_FLAG = 0x80000000
+
+# One revision suffix: ^{type}, ~N or ^N
+_REV_STEP = re.compile(r"\^\{([a-z]*)\}|([~^])([0-9]*)")
+_PEEL_TYPES = ("", "commit", "tree", "blob", "tag", "object")
+_HINTS = {"commit": "commit", "tree": "tree", "blob": "blob"}
+_HEX = frozenset("0123456789abcdef")
+_REGULAR = frozenset(("100644", "100755"))
+
+
+def _mmap(path: Path) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _inflate(buf, pos: int) -> bytes:
+    """Decompress the zlib stream starting at ``pos`` without knowing its length."""
+    d = zlib.decompressobj()
+    out = []
+    step = 4096
+    while not d.eof:
+        chunk = buf[pos : pos + step]
+        if not chunk:
+            raise ValueError("truncated zlib stream")
+        out.append(d.decompress(chunk))
+        pos += step
+        step = min(step * 4, 1 << 20)
+    return b"".join(out)
+
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    def varint(pos: int) -> Tuple[int, int]:
+        value = shift = 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value, pos
+
+    _, pos = varint(0)  # source size
+    size, pos = varint(pos)
+    out = bytearray()
+    while pos < len(delta):
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:  # copy from base
+            offset = length = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (0x10 << i):
+                    length |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset : offset + (length or 0x10000)]
+        elif op:  # insert literal
+            out += delta[pos : pos + op]
+            pos += op
+        else:
+            raise ValueError("invalid delta opcode 0")
+    if len(out) != size:
+        raise ValueError("delta produced wrong size")
+    return bytes(out)
+
+
+class PackIndex:
+    """Version 2 ``.idx`` file, memory-mapped and searched in place."""
+
+    def __init__(self, path: Path):
+        self.mm = _mmap(path)
+        if self.mm[:8] != b"\377tOc\x00\x00\x00\x02":
+            raise ValueError(f"unsupported pack index {path}")
+        self.fanout = struct.unpack_from(">256I", self.mm, 8)
+        self.count = self.fanout[255]
+        self._names = 8 + 256 * 4
+        self._offsets = self._names + self.count * 24  # skip names + CRCs
+        self._large = self._offsets + self.count * 4
+
+    def _name(self, i: int) -> bytes:
+        start = self._names + i * 20
+        return self.mm[start : start + 20]
+
+    def offset(self, sha: bytes) -> Optional[int]:
+        lo = self.fanout[sha[0] - 1] if sha[0] else 0
+        hi = self.fanout[sha[0]]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name = self._name(mid)
+            if name < sha:
+                lo = mid + 1
+            elif name > sha:
+                hi = mid
+            else:
+                (off,) = struct.unpack_from(">I", self.mm, self._offsets + mid * 4)
+                if off & 0x80000000:
+                    (off,) = struct.unpack_from(">Q", self.mm, self._large + (off & 0x7FFFFFFF) * 8)
+                return off
+        return None
+
+    def with_prefix(self, prefix: str, limit: int = 2) -> List[bytes]:
+        """Up to ``limit`` object names starting with the hex ``prefix`` (at least 2 digits)."""
+        first = int(prefix[:2], 16)
+        lo = self.fanout[first - 1] if first else 0
+        hi = self.fanout[first]
+        low = bytes.fromhex(prefix.ljust(40, "0"))
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name(mid) < low:
+                lo = mid + 1
+            else:
+                hi = mid
+        out = []
+        while lo < self.count and len(out) < limit:
+            name = self._name(lo)
+            if not name.hex().startswith(prefix):
+                break
+            out.append(name)
+            lo += 1
+        return out
+
+
+class Pack:
+    def __init__(self, idx_path: Path):
+        self.index = PackIndex(idx_path)
+        self.path = idx_path.with_suffix(".pack")
+        self._data: Optional[mmap.mmap] = None
+
+    @property
+    def data(self) -> mmap.mmap:
+        if self._data is None:
+            self._data = _mmap(self.path)
+        return self._data
+
+    def entry(self, offset: int) -> Tuple[int, int, Optional[object]]:
+        """Return ``(type, data position, delta base)`` of the entry at ``offset``."""
+        mm = self.data
+        byte = mm[offset]
+        kind = (byte >> 4) & 7
+        pos = offset + 1
+        while byte & 0x80:  # skip the rest of the size varint
+            byte = mm[pos]
+            pos += 1
+        if kind == _OFS_DELTA:
+            byte = mm[pos]
+            pos += 1
+            rel = byte & 0x7F
+            while byte & 0x80:
+                byte = mm[pos]
+                pos += 1
+                rel = ((rel + 1) << 7) | (byte & 0x7F)
+            return kind, pos, offset - rel
+        if kind == _REF_DELTA:
+            return kind, pos + 20, bytes(mm[pos : pos + 20])
+        return kind, pos, None
+
+
+class CommitGraph:
+    """
+    Reader for ``objects/info/commit-graph`` (or a split commit-graph chain):
+    parent lists and generation numbers without inflating any commit.
+    """
+
+    def __init__(self, paths: List[Path]):
+        self.layers = []
+        base = 0
+        for path in paths:
+            layer = self._load(path, base)
+            self.layers.append(layer)
+            base += layer["count"]
+        self.count = base
+
+    @classmethod
+    def open(cls, objects_dir: Path) -> Optional["CommitGraph"]:
+        single = objects_dir / "info" / "commit-graph"
+        chain = objects_dir / "info" / "commit-graphs" / "commit-graph-chain"
+        try:
+            if chain.exists():
+                hashes = chain.read_text().split()
+                return cls([chain.parent / f"graph-{h}.graph" for h in hashes])
+            if single.exists():
+                return cls([single])
+        except (OSError, ValueError, struct.error):
+            pass
+        return None
+
+    @staticmethod
+    def _load(path: Path, base: int) -> dict:
+        mm = _mmap(path)
+        if mm[:4] != b"CGPH" or mm[4] != 1 or mm[5] != 1:
+            raise ValueError(f"unsupported commit-graph {path}")
+        chunks = {}
+        for i in range(mm[6] + 1):
+            cid, off = struct.unpack_from(">4sQ", mm, 8 + i * 12)
+            chunks[cid] = off
+        fanout = struct.unpack_from(">256I", mm, chunks[b"OIDF"])
+        return {
+            "mm": mm,
+            "base": base,
+            "count": fanout[255],
+            "fanout": fanout,
+            "oidl": chunks[b"OIDL"],
+            "cdat": chunks[b"CDAT"],
+            "edge": chunks.get(b"EDGE"),
+        }
+
+    def _layer_of(self, pos: int) -> dict:
+        for layer in reversed(self.layers):
+            if pos >= layer["base"]:
+                return layer
+        raise IndexError(pos)
+
+    def position(self, sha: bytes) -> Optional[int]:
+        for layer in self.layers:
+            mm, fan = layer["mm"], layer["fanout"]
+            lo = fan[sha[0] - 1] if sha[0] else 0
+            hi = fan[sha[0]]
+            oidl = layer["oidl"]
+            while lo < hi:
+                mid = (lo + hi) // 2
+                name = mm[oidl + mid * 20 : oidl + mid * 20 + 20]
+                if name < sha:
+                    lo = mid + 1
+                elif name > sha:
+                    hi = mid
+                else:
+                    return layer["base"] + mid
+        return None
+
+    def sha(self, pos: int) -> bytes:
+        layer = self._layer_of(pos)
+        start = layer["oidl"] + (pos - layer["base"]) * 20
+        return layer["mm"][start : start + 20]
+
+    def _record(self, pos: int) -> Tuple[dict, int]:
+        layer = self._layer_of(pos)
+        return layer, layer["cdat"] + (pos - layer["base"]) * 36
+
+    def parents(self, pos: int) -> List[int]:
+        layer, rec = self._record(pos)
+        mm = layer["mm"]
+        p1, p2 = struct.unpack_from(">II", mm, rec + 20)
+        out = [] if p1 == _GRAPH_NO_PARENT else [p1]
+        if p2 == _GRAPH_NO_PARENT:
+            return out
+        if not p2 & _GRAPH_EDGE_FLAG:
+            return out + [p2]
+        edge = layer["edge"] + (p2 & ~_GRAPH_EDGE_FLAG) * 4
+        while True:
+            (value,) = struct.unpack_from(">I", mm, edge)
+            out.append(value & ~_GRAPH_EDGE_FLAG)
+            if value & _GRAPH_EDGE_FLAG:
+                return out
+            edge += 4
+
+    def generation(self, pos: int) -> int:
+        """Topological level (1 for root commits)."""
+        layer, rec = self._record(pos)
+        (word,) = struct.unpack_from(">I", layer["mm"], rec + 28)
+        return word >> 2
+
+
+class ObjectStore:
+    """Read-only access to loose objects, packfiles and alternates of a repository."""
+
+    def __init__(self, objects_dir: Path, cache_size: int = 256):
+        self.dirs = [objects_dir]
+        alternates = objects_dir / "info" / "alternates"
+        if alternates.exists():
+            for line in alternates.read_text().splitlines():
+                if line and not line.startswith("#"):
+                    self.dirs.append((objects_dir / line).resolve())
+        self._packs: Optional[List[Pack]] = None
+        self._cache: "OrderedDict[bytes, Tuple[str, bytes]]" = OrderedDict()
+        self._cache_size = cache_size
+
+    @property
+    def packs(self) -> List[Pack]:
+        if self._packs is None:
+            self._packs = [
+                Pack(idx) for d in self.dirs for idx in sorted((d / "pack").glob("pack-*.idx"))
+            ]
+        return self._packs
+
+    def _loose(self, sha: bytes) -> Optional[Tuple[str, bytes]]:
+        hexsha = sha.hex()
+        for d in self.dirs:
+            path = d / hexsha[:2] / hexsha[2:]
+            if path.exists():
+                raw = zlib.decompress(path.read_bytes())
+                header, _, data = raw.partition(b"\0")
+                return header.split()[0].decode(), data
+        return None
+
+    def _unpack(self, pack: Pack, offset: int) -> Tuple[str, bytes]:
+        kind, pos, base = pack.entry(offset)
+        if kind in _OBJ_TYPES:
+            return _OBJ_TYPES[kind], _inflate(pack.data, pos)
+        if kind == _OFS_DELTA:
+            base_kind, base_data = self._unpack(pack, base)
+        elif kind == _REF_DELTA:
+            found = self.read_raw(base)
+            if found is None:
+                raise KeyError(f"missing delta base {base.hex()}")
+            base_kind, base_data = found
+        else:
+            raise ValueError(f"bad pack entry type {kind}")
+        return base_kind, _apply_delta(base_data, _inflate(pack.data, pos))
+
+    def read_raw(self, sha: bytes) -> Optional[Tuple[str, bytes]]:
+        """Return ``(type, content)`` for a binary SHA, or None if absent."""
+        if sha in self._cache:
+            self._cache.move_to_end(sha)
+            return self._cache[sha]
+        obj = None
+        for pack in self.packs:
+            offset = pack.index.offset(sha)
+            if offset is not None:
+                obj = self._unpack(pack, offset)
+                break
+        else:
+            obj = self._loose(sha)
+        if obj is not None:
+            self._cache[sha] = obj
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return obj
+
+    def expand(self, prefix: str, limit: int = 256) -> List[str]:
+        """Names of the objects (at most ``limit``) starting with the hex ``prefix``."""
+        found = set()
+        for pack in self.packs:
+            found.update(name.hex() for name in pack.index.with_prefix(prefix, limit))
+        for d in self.dirs:
+            fan = d / prefix[:2]
+            if fan.is_dir():
+                found.update(prefix[:2] + f.name for f in fan.glob(prefix[2:] + "*"))
+        return sorted(found)[:limit]
+
+    def read(self, hexsha: str) -> Optional[Tuple[str, bytes]]:
+        try:
+            return self.read_raw(bytes.fromhex(hexsha))
+        except ValueError:
+            return None
+
+
+def _iso_date(ident: bytes) -> str:
+    """``%(creatordate:iso-strict)`` of a ``Name <email> <epoch> <+hhmm>`` line."""
+    epoch, tz = ident.rsplit(b" ", 2)[1:]
+    minutes = int(tz[1:3]) * 60 + int(tz[3:5])
+    offset = timedelta(minutes=-minutes if tz[:1] == b"-" else minutes)
+    return datetime.fromtimestamp(int(epoch), timezone(offset)).isoformat()
+
+
+def parse_commit(data: bytes) -> dict:
+    """Split a raw commit (or tag) into its tree, parents, creator date and message."""
+    headers, _, message = data.partition(b"\n\n")
+    commit = {
+        "tree": None,
+        "parents": [],
+        "date": "",
+        "message": message.decode("utf-8", "replace"),
+    }
+    for line in headers.split(b"\n"):
+        key, _, value = line.partition(b" ")
+        if key == b"tree":
+            commit["tree"] = value.decode()
+        elif key == b"parent":
+            commit["parents"].append(value.decode())
+        elif key in (b"committer", b"tagger"):
+            commit["date"] = _iso_date(value)
+    return commit
+
+
+def iter_tree(data: bytes) -> Iterator[Tuple[str, str, str]]:
+    """Yield ``(mode, name, hex sha)`` for each raw tree entry."""
+    pos = 0
+    while pos < len(data):
+        space = data.index(b" ", pos)
+        nul = data.index(b"\0", space)
+        yield (
+            data[pos:space].decode(),
+            data[space + 1 : nul].decode("utf-8", "surrogateescape"),
+            data[nul + 1 : nul + 21].hex(),
+        )
+        pos = nul + 21
+
+
+class NativeBackend(GitBackend):
+    """
+    Subprocess-free backend reading ``.git`` directly: refs and packed-refs,
+    loose objects, packfiles through mmap'd ``.idx`` files, and the commit-graph
+    file for parent lookups when present.
+    """
+
+    def __init__(self, git_dir: Optional[Path] = None):
+        self.git_dir = Path(git_dir) if git_dir else find_git_dir()
+        common = self.git_dir / "commondir"
+        self.common_dir = (
+            (self.git_dir / common.read_text().strip()).resolve()
+            if common.exists()
+            else self.git_dir
+        )
+        objects = Path(os.getenv("GIT_OBJECT_DIRECTORY") or self.common_dir / "objects")
+        self.store = ObjectStore(objects)
+        self.graph = CommitGraph.open(objects)
+        self._packed: Optional[Dict[str, Tuple[str, Optional[str]]]] = None
+
+    # -- refs -----------------------------------------------------------------
+
+    def _packed_refs(self) -> Dict[str, Tuple[str, Optional[str]]]:
+        if self._packed is None:
+            self._packed = {}
+            path = self.common_dir / "packed-refs"
+            last = None
+            if path.exists():
+                for line in path.read_text().splitlines():
+                    if line.startswith("#") or not line:
+                        continue
+                    if line.startswith("^") and last:
+                        self._packed[last] = (self._packed[last][0], line[1:])
+                        continue
+                    sha, last = line.split(" ", 1)
+                    self._packed[last] = (sha, None)
+        return self._packed
+
+    def _read_ref(self, ref: str, depth: int = 0) -> Optional[str]:
+        if depth > 5:
+            return None
+        base = self.git_dir if ref == "HEAD" or "/" not in ref else self.common_dir
+        path = base / ref
+        if path.is_file():
+            value = path.read_text().strip()
+            if value.startswith("ref: "):
+                return self._read_ref(value[5:], depth + 1)
+            return value
+        packed = self._packed_refs().get(ref)
+        return packed[0] if packed else None
+
+    def _refs(self, prefix: str) -> Dict[str, Tuple[str, Optional[str]]]:
+        """``{refname: (sha, peeled sha)}`` for loose and packed refs under ``prefix``."""
+        refs = {n: v for n, v in self._packed_refs().items() if n.startswith(prefix)}
+        root = self.common_dir / prefix
+        for path in root.rglob("*") if root.is_dir() else ():
+            if path.is_file():
+                sha = path.read_text().strip()
+                refs[path.relative_to(self.common_dir).as_posix()] = (sha, None)
+        return refs
+
+    def symbolic_head(self) -> Optional[str]:
+        head = (self.git_dir / "HEAD").read_text().strip()
+        return head[5:] if head.startswith("ref: ") else None
+
+    def _dwim(self, name: str) -> Optional[str]:
+        """Full name of the ref ``name`` abbreviates, in ``git rev-parse`` order."""
+        for ref in (
+            name,
+            f"refs/{name}",
+            f"refs/tags/{name}",
+            f"refs/heads/{name}",
+            f"refs/remotes/{name}",
+            f"refs/remotes/{name}/HEAD",
+        ):
+            if self._read_ref(ref):
+                return ref
+        return None
+
+    def _reflog(self, name: str, n: int) -> Optional[str]:
+        """``name@{n}``: the value ``name`` had ``n`` updates ago."""
+        if name:
+            ref = self._dwim(name)
+        else:  # "@{n}" is the reflog of the current branch
+            ref = self.symbolic_head() or "HEAD"
+        if ref is None:
+            return None
+        log = (self.git_dir if ref == "HEAD" else self.common_dir) / "logs" / ref
+        lines = log.read_text().splitlines() if log.is_file() else []
+        return lines[-1 - n].split(" ", 2)[1] if n < len(lines) else None
+
+    def _expand(self, prefix: str, hint: Optional[str]) -> Optional[str]:
+        """
+        The object an abbreviated SHA names. Like git, an ambiguous prefix is narrowed
+        to the candidates that peel to the ``hint`` type the rest of the spec needs.
+        """
+        found = self.store.expand(prefix)
+        if len(found) > 1 and hint:
+            found = [sha for sha in found if self._peel(sha, hint) is not None]
+        return found[0] if len(found) == 1 else None
+
+    def _resolve_name(self, name: str, hint: Optional[str] = None) -> Optional[str]:
+        if name == "@":
+            name = "HEAD"
+        if name.endswith("}") and "@{" in name:
+            name, _, spec = name[:-1].rpartition("@{")
+            return self._reflog(name, int(spec)) if spec.isdigit() else None
+        if len(name) == 40 and _HEX.issuperset(name):
+            return name if self.store.read(name) else None
+        ref = self._dwim(name) if name else None
+        if ref:
+            return self._read_ref(ref)
+        if 4 <= len(name) < 40 and _HEX.issuperset(name.lower()):
+            return self._expand(name.lower(), hint)
+        return None
+
+    def _peel(self, sha: str, kind: Optional[str] = "commit") -> Optional[str]:
+        """
+        Follow tags (and a commit to its tree) down to a ``kind`` object; None peels
+        to the first non-tag (``^{}``).
+        """
+        for _ in range(10):
+            obj = self.store.read(sha)
+            if obj is None:
+                return None
+            if obj[0] == kind or (kind is None and obj[0] != "tag"):
+                return sha
+            if obj[0] == "commit" and kind == "tree":
+                return parse_commit(obj[1])["tree"]
+            if obj[0] != "tag":
+                return None
+            sha = obj[1].split(b"\n", 1)[0].split(b" ", 1)[1].decode()
+        return None
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """
+        Resolve a ref, ``name@{N}``, full or unique abbreviated SHA, followed by any
+        chain of ``~N``, ``^N`` and ``^{type}`` suffixes. Returns None where git fails,
+        and also for forms not supported here (``^{/text}``, ``@{-N}``, dates, ``:path``).
+        """
+        cut = min((i for i in (rev.find("~"), rev.find("^")) if i >= 0), default=len(rev))
+        first = _REV_STEP.match(rev, cut)
+        hint = None  # what an ambiguous abbreviated SHA must be, judging by the next step
+        if first is not None:
+            hint = "commit" if first.group(2) else _HINTS.get(first.group(1))
+        sha = self._resolve_name(rev[:cut], hint)
+        pos = cut
+        while sha and pos < len(rev):
+            m = _REV_STEP.match(rev, pos)
+            if m is None:
+                return None
+            pos = m.end()
+            kind, op, n = m.groups()
+            if op is None:
+                if kind not in _PEEL_TYPES:
+                    return None
+                if kind != "object":
+                    sha = self._peel(sha, kind or None)
+                continue
+            sha = self._peel(sha)
+            count = int(n) if n else 1
+            if op == "^":
+                if count:
+                    parents = (self.commit_parents(sha) or []) if sha else []
+                    sha = parents[count - 1] if len(parents) >= count else None
+            else:
+                for _ in range(count):
+                    sha = sha and (self.commit_parents(sha) or [None])[0]
+                    if sha is None:
+                        break
+        return sha
+
+    # -- GitBackend -------------------------------------------------------------
+
+    def current_branch(self) -> str:
+        ref = self.symbolic_head()
+        if ref is None:
+            return "HEAD"
+        return ref[len("refs/heads/") :] if ref.startswith("refs/heads/") else ref
+
+    def commit_sha(self, rev: str) -> Optional[str]:
+        return self.resolve(f"{rev}^{{commit}}")
+
+    def commit_message(self, rev: str) -> Optional[str]:
+        sha = self.commit_sha(rev)
+        obj = self.store.read(sha) if sha else None
+        return parse_commit(obj[1])["message"] if obj else None
+
+    def commit_parents(self, rev: str) -> Optional[List[str]]:
+        sha = self.commit_sha(rev) if len(rev) != 40 else rev
+        if sha is None:
+            return None
+        if self.graph is not None:
+            pos = self.graph.position(bytes.fromhex(sha))
+            if pos is not None:
+                return [self.graph.sha(p).hex() for p in self.graph.parents(pos)]
+        sha = self._peel(sha)
+        obj = self.store.read(sha) if sha else None
+        return parse_commit(obj[1])["parents"] if obj else None
+
+    def list_tags(self, merged: Optional[str] = None, sort: str = "-creatordate") -> List[TagInfo]:
+        if merged and self.commit_sha(merged) is None:
+            raise KeyError(f"unknown revision {merged}")
+        tags = []
+        for ref, (sha, peeled) in self._refs("refs/tags/").items():
+            obj = self.store.read(sha)
+            if obj is None:
+                continue
+            date = parse_commit(obj[1])["date"]  # tagger date of an annotated tag
+            commit = peeled or self._peel(sha)
+            if commit is None:
+                continue
+            tags.append(
+                TagInfo(
+                    name=ref[len("refs/tags/") :],
+                    commit=commit,
+                    date=date,
+                    subject=self.commit_subject(commit) or "",
+                )
+            )
+        if merged:
+            from versioning_tool.reachability import reachability
+
+            tags = reachability().tags_on(merged, tags)
+        # like for-each-ref: ties keep refname order even when the key is reversed
+        tags.sort(key=lambda t: t.name)
+        if sort.lstrip("-") in ("creatordate", "taggerdate", "committerdate"):
+            tags.sort(
+                key=lambda t: datetime.fromisoformat(t.date),
+                reverse=sort.startswith("-"),
+            )
+        elif sort.startswith("-"):
+            tags.reverse()
+        return tags
+
+    def list_branches(self, sort: str = "-committerdate") -> List[BranchInfo]:
+        branches = []
+        for ref, (sha, _) in self._refs("refs/heads/").items():
+            obj = self.store.read(sha)
+            if obj is None or obj[0] != "commit":
+                continue
+            branches.append(
+                BranchInfo(
+                    name=ref[len("refs/heads/") :],
+                    commit=sha,
+                    date=parse_commit(obj[1])["date"],
+                    subject=self.commit_subject(sha) or "",
+                )
+            )
+        branches.sort(key=lambda b: b.name)
+        if sort.lstrip("-") in ("committerdate", "creatordate"):
+            branches.sort(
+                key=lambda b: datetime.fromisoformat(b.date), reverse=sort.startswith("-")
+            )
+        elif sort.startswith("-"):
+            branches.reverse()
+        return branches
+
+    def invalidate(self, refs: Optional[Iterable[str]] = None):
+        # only packed-refs is cached, and a fetch or gc may have added packs
+        self._packed = None
+        self.store = ObjectStore(self.store.dirs[0])
+        self.graph = CommitGraph.open(self.store.dirs[0])
+
+    def _tree(self, rev: str) -> Optional[str]:
+        sha = self.commit_sha(rev)
+        obj = self.store.read(sha) if sha else None
+        return parse_commit(obj[1])["tree"] if obj else None
+
+    def _diff_trees(self, a: Optional[str], b: Optional[str], prefix: str, out: list):
+        """Append ``(path, old (mode, sha) or None, new (mode, sha) or None)`` per changed file."""
+
+        def entries(sha):
+            obj = self.store.read(sha) if sha else None
+            return {name: (mode, s) for mode, name, s in iter_tree(obj[1])} if obj else {}
+
+        old, new = entries(a), entries(b)
+        for name in sorted(old.keys() | new.keys()):
+            left, right = old.get(name), new.get(name)
+            if left == right:
+                continue
+            path = prefix + name
+            left_dir = left is not None and left[0] == "40000"
+            right_dir = right is not None and right[0] == "40000"
+            if left_dir or right_dir:
+                self._diff_trees(
+                    left[1] if left_dir else None, right[1] if right_dir else None, path + "/", out
+                )
+            left, right = (None if left_dir else left), (None if right_dir else right)
+            if left is not None or right is not None:
+                out.append((path, left, right))
+
+    def changed_files(self, base: str, head: str) -> List[str]:
+        """
+        Paths differing between the trees of ``base`` and ``head``, as listed by
+        ``git diff --name-only base..head``: a file moved without edits is paired
+        with its source (git's exact rename detection), so only the new path is
+        listed. A file both moved and edited is listed under both paths, where git
+        would pair the two when they are at least 50% similar.
+        """
+        a, b = self._tree(base), self._tree(head)
+        if b is None or a is None:
+            raise KeyError(f"unknown revision {base if a is None else head}")
+        changes: list = []
+        self._diff_trees(a, b, "", changes)
+        deleted: Dict[str, List[Tuple[str, str]]] = {}
+        for path, left, right in changes:
+            if right is None:
+                deleted.setdefault(left[1], []).append((path, left[0]))
+        renamed = set()
+        for path, left, right in changes:
+            if left is not None:
+                continue
+            sources = [
+                (src, mode)
+                for src, mode in deleted.get(right[1], ())
+                if src not in renamed and (mode == right[0] or {mode, right[0]} <= _REGULAR)
+            ]
+            if sources:  # prefer a source with the same file name
+                name = path.rpartition("/")[2]
+                same = [src for src, _ in sources if src.rpartition("/")[2] == name]
+                renamed.add(same[0] if same else sources[0][0])
+        return sorted(
+            path for path, _, right in changes if right is not None or path not in renamed
+        )
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import fnmatch
+
+from typing import Dict, Iterable, Iterator, Optional
+
+from versioning_tool.core import get_backend, get_session, list_branches
+from versioning_tool.cache import classify_commits, commits_in_ranges
+from versioning_tool.rules import compile_bump_rules
+from versioning_tool.reachability import reachability
+
+try:
+    import tomllib
+except Exception:
+    import tomli as tomllib  # type: ignore
+
+
+def _version_at(head: str, blobs: Dict[str, str]) -> Optional[str]:
+    """``[project].version`` of ``pyproject.toml`` in ``head``, parsed once per blob."""
+    session = get_session()
+    info = session.object_info(f"{head}:pyproject.toml")
+    if info is None:
+        return None
+    blob = info[0]
+    if blob not in blobs:
+        obj = session.read_object(blob)
+        try:
+            project = tomllib.loads(obj[2].decode("utf-8")).get("project", {}) if obj else {}
+        except (UnicodeDecodeError, tomllib.TOMLDecodeError):
+            project = {}
+        blobs[blob] = project.get("version")
+    return blobs[blob]
+
+
+def _resolve_base(cfg: dict, base: Optional[str]) -> str:
+    if base:
+        return base
+    default = cfg.get("default_branch", "main")
+    remote = f"origin/{default}"
+    return remote if get_backend().commit_sha(remote) else default
+
+
+def plan_branches(
+    cfg: dict, patterns: Iterable[str] = ("*",), base: Optional[str] = None
+) -> Iterator[dict]:
+    """
+    Yield the bump decision of every local branch matching ``patterns`` against
+    ``base`` (default ``origin/<default_branch>``), all from one process.
+
+    Branch tips come from one ``for-each-ref``; branches already merged into the
+    base are found with a single reachability walk; the commits of all other
+    branches come from one walk of the union of their ranges and are classified
+    once each; ``pyproject.toml`` blobs shared by several branches are parsed once.
+    """
+    from versioning_tool.version_manager import decide_from_commits
+
+    base = _resolve_base(cfg, base)
+    default = cfg.get("default_branch", "main")
+    patterns = list(patterns)
+    branches = [
+        b
+        for b in list_branches()
+        if b.name != default and any(fnmatch.fnmatchcase(b.name, pat) for pat in patterns)
+    ]
+    merged = reachability().ancestors_among((b.commit for b in branches), base)
+
+    todo = list(dict.fromkeys(b.commit for b in branches if b.commit not in merged))
+    ranges = commits_in_ranges(base, todo)
+    # Classify each commit once, however many branches contain it
+    union = list({c.sha: c for commits in ranges.values() for c in commits}.values())
+    rules = compile_bump_rules(cfg.get("conventional_bump", {}))
+    levels = dict(zip((c.sha for c in union), classify_commits(union, rules)))
+
+    blobs: Dict[str, str] = {}
+    for branch in branches:
+        current = _version_at(branch.commit, blobs) or "0.0.0"
+        row = {
+            "branch": branch.name,
+            "head": branch.commit,
+            "base": base,
+            "current": current,
+        }
+        if branch.commit in merged:
+            row.update(suggested=current, bump="none", reason="merged into base", commits=0)
+            yield row
+            continue
+        commits = ranges[branch.commit]
+        suggested, reason, bump = decide_from_commits(
+            cfg, branch.name, current, commits, levels=levels
+        )
+        row.update(suggested=suggested, bump=bump, reason=reason, commits=len(commits))
+        yield row
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import re
+import subprocess
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from versioning_tool.core import TagInfo, get_backend, get_session
+
+_SHA = re.compile(r"[0-9a-f]{40}")
+
+
+class ReachabilityIndex:
+    """
+    In-memory ancestry index: parent lists plus generation numbers, so that
+    ``is_ancestor`` only walks the part of history that can still reach the target.
+
+    Commits covered by ``.git/objects/info/commit-graph`` are read straight from
+    the mmap'd file; without one, the whole history is loaded from a single
+    ``git rev-list --parents --topo-order --all`` dump. Commits newer than either
+    source (e.g. created after the last ``git gc``) are looked up on demand.
+    """
+
+    def __init__(self, graph=None, parents: Optional[Dict[str, List[str]]] = None):
+        self.graph = graph
+        self._parents: Dict[str, List[str]] = dict(parents or {})
+        self._gen: Dict[str, int] = {}
+        self._resolved: Dict[str, Optional[str]] = {}
+        if parents:
+            self._number(reversed(list(parents)))
+
+    @classmethod
+    def load(cls) -> "ReachabilityIndex":
+        from versioning_tool.objects import CommitGraph, NativeBackend
+
+        backend = get_backend()
+        if isinstance(backend, NativeBackend):
+            return cls(graph=backend.graph)  # no git to ask for a dump
+        session = get_session()
+        common = Path(session.run(["rev-parse", "--git-common-dir"])).resolve()
+        graph = CommitGraph.open(common / "objects")
+        if graph is not None:
+            return cls(graph=graph)
+        parents = {}
+        out = session.run(["rev-list", "--parents", "--topo-order", "--all", "HEAD"])
+        for line in out.splitlines():
+            sha, *rest = line.split()
+            parents[sha] = rest
+        return cls(parents=parents)
+
+    def _number(self, shas: Iterable[str]):
+        """Assign generations, parents first (``shas`` in reverse topological order)."""
+        for sha in shas:
+            self._gen[sha] = 1 + max((self._gen[p] for p in self._parents[sha]), default=0)
+
+    def parents(self, sha: str) -> List[str]:
+        found = self._parents.get(sha)
+        if found is not None:
+            return found
+        pos = self.graph.position(bytes.fromhex(sha)) if self.graph is not None else None
+        if pos is not None:
+            found = [self.graph.sha(p).hex() for p in self.graph.parents(pos)]
+            gen = self.graph.generation(pos)
+            if gen:  # 0 means the graph was written without generation numbers
+                self._gen[sha] = gen
+        else:
+            found = get_backend().commit_parents(sha) or []
+        self._parents[sha] = found
+        return found
+
+    def generation(self, sha: str) -> int:
+        """Topological level of ``sha``: 1 for roots, 1 + the highest parent otherwise."""
+        stack = [sha]
+        while stack:
+            top = stack[-1]
+            parents = self.parents(top)  # may fill in the level from the commit-graph
+            if top in self._gen:
+                stack.pop()
+                continue
+            pending = [p for p in parents if p not in self._gen]
+            if pending:
+                stack.extend(pending)
+            else:
+                self._number([stack.pop()])
+        return self._gen[sha]
+
+    def resolve(self, rev: str) -> Optional[str]:
+        if _SHA.fullmatch(rev):
+            return rev
+        if rev not in self._resolved:
+            try:
+                self._resolved[rev] = get_backend().commit_sha(rev)
+            except (subprocess.CalledProcessError, KeyError, ValueError):
+                self._resolved[rev] = None
+        return self._resolved[rev]
+
+    def forget_names(self):
+        """Drop resolved ref names after refs moved; commits and generations never change."""
+        self._resolved.clear()
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """True if ``ancestor`` is reachable from ``descendant`` (a commit is its own ancestor)."""
+        a, b = self.resolve(ancestor), self.resolve(descendant)
+        if a is None or b is None:
+            return False
+        if a == b:
+            return True
+        ga = self.generation(a)
+        if ga >= self.generation(b):
+            return False
+        stack, seen = [b], {b}
+        while stack:
+            for p in self.parents(stack.pop()):
+                if p == a:
+                    return True
+                # anything at or below a's level can't have a as an ancestor
+                if p not in seen and self.generation(p) > ga:
+                    seen.add(p)
+                    stack.append(p)
+        return False
+
+    def ancestors_among(self, candidates: Iterable[str], descendant: str) -> Set[str]:
+        """
+        The subset of ``candidates`` (commit SHAs) reachable from ``descendant``, from
+        a single walk that stops below the lowest candidate's generation.
+        """
+        head = self.resolve(descendant)
+        wanted = {c for c in candidates if c}
+        if head is None or not wanted:
+            return set()
+        floor = min(self.generation(c) for c in wanted)
+        found, stack, seen = set(), [head], {head}
+        while stack and len(found) < len(wanted):
+            sha = stack.pop()
+            if sha in wanted:
+                found.add(sha)
+            for p in self.parents(sha):
+                if p not in seen and self.generation(p) >= floor:
+                    seen.add(p)
+                    stack.append(p)
+        return found
+
+    def tags_on(self, branch: str, tags: Iterable[TagInfo]) -> List[TagInfo]:
+        """Keep the tags whose commit is reachable from ``branch``."""
+        tags = list(tags)
+        reachable = self.ancestors_among((t.commit for t in tags), branch)
+        return [t for t in tags if t.commit in reachable]
+
+
+_index: Optional[ReachabilityIndex] = None
+
+
+def reachability() -> ReachabilityIndex:
+    """Return the process-wide reachability index, loading it on first use."""
+    global _index
+    if _index is None:
+        _index = ReachabilityIndex.load()
+    return _index
+
+
+def forget_names():
+    """``ReachabilityIndex.forget_names`` on the process-wide index, if it is loaded."""
+    if _index is not None:
+        _index.forget_names()
+
+
+def is_ancestor(ancestor: str, descendant: str) -> bool:
+    return reachability().is_ancestor(ancestor, descendant)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-import re
+import json
+import hashlib
 import fnmatch
 
+from functools import lru_cache
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from packaging.version import Version
+from versioning_tool.core import Commit
+from versioning_tool.semver import parse_version
+from versioning_tool.conventional import RuleSet, parse_commit, parse_message
 
 BUMP_ORDER = ["patch", "minor", "major"]  # ascending
 
@@ -25,26 +29,96 @@ def branch_match(branch: str, patterns: Dict[str, dict]) -> Optional[Tuple[str,
     return None
 
 
+class BumpRules:
+    """
+    Conventional-commit bump rules compiled once from ``conventional_bump``.
+
+    Levels are checked from highest to lowest so classification stops at the
+    first (i.e. highest) level that matches. Messages are tokenized once (see
+    ``conventional``) and most rules are answered from the parsed header.
+    """
+
+    def __init__(self, bump_cfg: dict):
+        self.levels: List[Tuple[str, RuleSet]] = []
+        source = {}
+        for level in reversed(BUMP_ORDER):
+            patterns = tuple(bump_cfg.get(level) or [])
+            if patterns:
+                self.levels.append((level, RuleSet(patterns)))
+                source[level] = patterns
+        # Stable identity of the rule set, e.g. for keying cached classifications
+        self.fingerprint = hashlib.sha1(json.dumps(source).encode()).hexdigest()
+
+    def classify(self, msg: str) -> Optional[str]:
+        """Return the highest bump level ``msg`` matches, or None."""
+        cc = parse_message(msg)
+        for level, rules in self.levels:
+            if rules.match(cc, msg):
+                return level
+        return None
+
+    def classify_commit(self, commit: Commit) -> Optional[str]:
+        """``classify`` for a Commit (subject and breaking footers), tokenized once per SHA."""
+        cc, text = parse_commit(commit), commit.rule_text
+        for level, rules in self.levels:
+            if rules.match(cc, text):
+                return level
+        return None
+
+    def classify_many(self, msgs: Iterable[str]) -> List[Optional[str]]:
+        """Classify every message in one pass."""
+        return [self.classify(m) for m in msgs]
+
+    def highest(self, msgs: Iterable[str]) -> Optional[str]:
+        """Return the highest bump across ``msgs``, stopping as soon as nothing can beat it."""
+        best = len(self.levels)  # index into self.levels; lower is higher
+        for m in msgs:
+            cc = parse_message(m)
+            for i in range(best):
+                _, rules = self.levels[i]
+                if rules.match(cc, m):
+                    best = i
+                    break
+            if best == 0:
+                break
+        return self.levels[best][0] if best < len(self.levels) else None
+
+    @staticmethod
+    def highest_of(levels: Iterable[Optional[str]]) -> Optional[str]:
+        """Reduce per-message levels (e.g. from ``classify_many``) to the highest one."""
+        found = [lvl for lvl in levels if lvl in BUMP_ORDER]
+        return max(found, key=BUMP_ORDER.index) if found else None
+
+
+@lru_cache(maxsize=32)
+def _compile_bump_rules(key: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> BumpRules:
+    return BumpRules({level: list(patterns) for level, patterns in key})
+
+
+def compile_bump_rules(bump_cfg: dict) -> BumpRules:
+    """Return the compiled rules for ``bump_cfg``, reusing them across calls."""
+    key = tuple((level, tuple(bump_cfg.get(level) or [])) for level in BUMP_ORDER)
+    return _compile_bump_rules(key)
+
+
 def conventional_commit_bump(msgs: List[str], bump_cfg: dict) -> Optional[str]:
     """
     Returns highest bump suggested by commit messages.
     """
-    matched = set()
-    for level in ["major", "minor", "patch"]:
-        rules: List[str] = bump_cfg.get(level, [])
-        regexes = [re.compile(r) for r in rules]
-        if any(any(r.search(m) for r in regexes) for m in msgs):
-            matched.add(level)
-    if not matched:
-        return None
-    # pick highest according to BUMP_ORDER
-    highest = max(matched, key=lambda x: BUMP_ORDER.index(x))
-    return highest
+    return compile_bump_rules(bump_cfg).highest(msgs)
 
 
 def decide_bump(
-    branch: str, msgs: List[str], cfg: dict, current_version: str | None = None
+    branch: str,
+    msgs: List[str],
+    cfg: dict,
+    current_version: str | None = None,
+    levels: Optional[List[Optional[str]]] = None,
 ) -> BumpDecision:
+    """
+    ``levels`` may carry precomputed per-message bump levels (e.g. from the
+    commit cache) so the conventional rules are not re-run over ``msgs``.
+    """
     # Branch-specific overrides (hotfix/* etc.)
     br = branch_match(branch, cfg.get("branch_types", {}))
     prerelease = None
@@ -55,7 +129,10 @@ def decide_bump(
         branch_forced_bump = br_cfg.get("bump")
 
     # Conventional commits
-    conv = conventional_commit_bump(msgs, cfg.get("conventional_bump", {}))
+    if levels is not None:
+        conv = BumpRules.highest_of(levels)
+    else:
+        conv = conventional_commit_bump(msgs, cfg.get("conventional_bump", {}))
 
     # If branch forces bump (e.g., hotfix/*), that wins for stable release scenario
     bump = branch_forced_bump or conv
@@ -69,23 +146,10 @@ def decide_bump(
 
 
 def next_version(current: str, decision: BumpDecision) -> str:
-    v = Version(current)
+    v = parse_version(current)
     if decision.prerelease:
-        label = decision.prerelease
-        # if already on same prerelease channel -> increment number
-        if v.pre and v.pre[0] == label:
-            num = v.pre[1] + 1
-            return f"{v.major}.{v.minor}.{v.micro}-{label}.{num}"
-        # reset to .1 from baseline (same major/minor/patch)
-        return f"{v.major}.{v.minor}.{v.micro}-{label}.1"
+        # same prerelease channel -> increment number, otherwise .1 on the same release
+        return str(v.next_prerelease(decision.prerelease))
 
     # stable release path
-    bump = decision.bump or "patch"
-    if bump == "major":
-        return f"{v.major + 1}.0.0"
-    if bump == "minor":
-        return f"{v.major}.{v.minor + 1}.0"
-    if bump == "patch":
-        return f"{v.major}.{v.minor}.{v.micro + 1}"
-
-    return f"{v.major}.{v.minor}.{v.micro}"
+    return str(v.bump(decision.bump or "patch"))
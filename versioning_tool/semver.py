@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import re
+
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# "1.2.3", "v1.2.3", "1.2.3-alpha.1" (what next_version emits), and the PEP 440
+# spellings packaging produces ("1.2.3a1", "1.2.3rc2").
+_SEMVER = re.compile(
+    r"""
+    [vV]?(?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?
+    (?:[-_.]?(?P<label>[a-zA-Z]+)[-_.]?(?P<num>\d+)?)?
+    (?:\+[0-9A-Za-z.-]+)?
+    """,
+    re.VERBOSE,
+)
+
+# Prerelease spellings that name the same channel
+_CHANNELS = {"a": "alpha", "b": "beta", "c": "rc", "pre": "rc", "preview": "rc"}
+_NOT_PRERELEASE = {"post", "rev", "r", "dev"}  # left to packaging
+
+
+def channel(label: str) -> str:
+    """Canonical prerelease channel of ``label`` ("a" and "alpha" are the same channel)."""
+    label = label.lower()
+    return _CHANNELS.get(label, label)
+
+
+class SemVer:
+    """
+    Immutable ``major.minor.patch[-label.N]`` version. Instances hash and order by
+    semantic precedence (prereleases sort before their release), so they can be
+    used as dict keys and sorted directly.
+    """
+
+    __slots__ = ("major", "minor", "patch", "label", "num", "_key")
+
+    def __init__(self, major: int, minor: int = 0, patch: int = 0, label=None, num=None):
+        self.major = major
+        self.minor = minor
+        self.patch = patch
+        self.label = label
+        self.num = num
+        # a release (1) sorts after any of its prereleases (0)
+        pre = (1, "", 0) if label is None else (0, channel(label), num or 0)
+        self._key = (major, minor, patch) + pre
+
+    @staticmethod
+    def parse(text: str) -> "SemVer":
+        """Parse ``text`` (memoized); raises ValueError for anything unrecognizable."""
+        return _parse(text.strip())
+
+    @property
+    def release(self) -> Tuple[int, int, int]:
+        return self.major, self.minor, self.patch
+
+    @property
+    def is_prerelease(self) -> bool:
+        return self.label is not None
+
+    def bump(self, level: Optional[str]) -> "SemVer":
+        """Stable successor for ``level`` ("major"/"minor"/"patch"); None drops the prerelease."""
+        if level == "major":
+            return SemVer(self.major + 1)
+        if level == "minor":
+            return SemVer(self.major, self.minor + 1)
+        if level == "patch":
+            return SemVer(self.major, self.minor, self.patch + 1)
+        return SemVer(*self.release)
+
+    def next_prerelease(self, label: str) -> "SemVer":
+        """``label.N+1`` on the same channel, otherwise ``label.1`` on the same release."""
+        if self.label is not None and channel(self.label) == channel(label):
+            return SemVer(*self.release, label, (self.num or 0) + 1)
+        return SemVer(*self.release, label, 1)
+
+    def __str__(self) -> str:
+        base = f"{self.major}.{self.minor}.{self.patch}"
+        if self.label is None:
+            return base
+        return f"{base}-{self.label}.{self.num}" if self.num is not None else f"{base}-{self.label}"
+
+    def __repr__(self) -> str:
+        return f"SemVer('{self}')"
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SemVer) and self._key == other._key
+
+    def __lt__(self, other: "SemVer") -> bool:
+        return self._key < other._key
+
+    def __le__(self, other: "SemVer") -> bool:
+        return self._key <= other._key
+
+    def __gt__(self, other: "SemVer") -> bool:
+        return self._key > other._key
+
+    def __ge__(self, other: "SemVer") -> bool:
+        return self._key >= other._key
+
+
+@lru_cache(maxsize=16384)
+def _parse(text: str) -> SemVer:
+    m = _SEMVER.fullmatch(text)
+    if m is None or (m.group("label") or "").lower() in _NOT_PRERELEASE:
+        return _parse_pep440(text)
+    num = m.group("num")
+    return SemVer(
+        int(m.group("major")),
+        int(m.group("minor") or 0),
+        int(m.group("patch") or 0),
+        m.group("label"),
+        int(num) if num is not None else None,
+    )
+
+
+def _parse_pep440(text: str) -> SemVer:
+    """Fallback for other PEP 440 forms (epochs, .postN, .devN), which are dropped."""
+    from packaging.version import InvalidVersion, Version
+
+    try:
+        v = Version(text)
+    except InvalidVersion as e:
+        raise ValueError(f"not a version: {text!r}") from e
+    label, num = v.pre if v.pre else (None, None)
+    return SemVer(v.major, v.minor, v.micro, label, num)
+
+
+def parse_version(text: str) -> SemVer:
+    return SemVer.parse(text)
+
+
+def version_key(text: str) -> tuple:
+    """Sort key for tag or version strings; unparsable ones sort first, by name."""
+    try:
+        return (1, SemVer.parse(text)._key)
+    except ValueError:
+        return (0, text)
+
+
+def sort_versions(names: Iterable[str], reverse: bool = False) -> List[str]:
+    """Sort tag/version names by semantic precedence."""
+    return sorted(names, key=version_key, reverse=reverse)
+
+
+def latest_version(names: Iterable[str], stable_only: bool = False) -> Optional[str]:
+    """Highest version among ``names`` (optionally ignoring prereleases), or None."""
+    best, best_key = None, None
+    for name in names:
+        try:
+            v = SemVer.parse(name)
+        except ValueError:
+            continue
+        if stable_only and v.is_prerelease:
+            continue
+        if best_key is None or v._key > best_key:
+            best, best_key = name, v._key
+    return best
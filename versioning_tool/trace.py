@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import threading
+
+from pathlib import Path
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Frames from these modules are plumbing, not the code that asked for a git call
+_PLUMBING = ("versioning_tool.core", "versioning_tool.trace", "contextlib", "asyncio", "threading")
+_NPLUS1 = 10  # calls of one subcommand from one call site worth flagging
+
+
+@dataclass
+class GitCall:
+    argv: List[str]
+    kind: str  # "run", "async", "stream" (git log) or "pipe" (cat-file request)
+    caller: str  # module.function:line of the first non-plumbing frame
+    start: float  # perf_counter() at start
+    thread: int = field(default_factory=threading.get_ident)
+    duration: float = 0.0
+    stdout_bytes: int = 0
+    ok: bool = True
+
+
+Hook = Callable[[GitCall], None]
+
+_hooks: List[Hook] = []
+_calls: Optional[List[GitCall]] = None
+_lock = threading.Lock()
+
+
+def add_hook(hook: Hook):
+    """Call ``hook(call)`` after every git call, whether or not recording is on."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook):
+    _hooks.remove(hook)
+
+
+def start():
+    """Start recording git calls (e.g. for ``--profile`` / ``--trace``)."""
+    global _calls
+    _calls = []
+
+
+def stop() -> List[GitCall]:
+    """Stop recording and return the calls recorded since ``start``."""
+    global _calls
+    calls, _calls = _calls or [], None
+    return calls
+
+
+def active() -> bool:
+    return _calls is not None or bool(_hooks)
+
+
+def _caller() -> str:
+    frame, outermost = sys._getframe(2), "?"
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        where = f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        if not module.startswith(_PLUMBING) and not module.startswith("concurrent."):
+            return where
+        if module.startswith("versioning_tool."):
+            outermost = where  # worker threads only see the helper they run
+        frame = frame.f_back
+    return outermost
+
+
+@contextmanager
+def span(argv: List[str], kind: str = "run") -> Iterator[Optional[GitCall]]:
+    """
+    Time one git call. Yields None when tracing is off, otherwise the GitCall
+    whose ``stdout_bytes`` the caller fills in.
+    """
+    if not active():
+        yield None
+        return
+    call = GitCall(argv=list(argv), kind=kind, caller=_caller(), start=time.perf_counter())
+    try:
+        yield call
+    except GeneratorExit:
+        raise  # a streaming consumer stopped early; the call itself did not fail
+    except BaseException:
+        call.ok = False
+        raise
+    finally:
+        call.duration = time.perf_counter() - call.start
+        with _lock:
+            if _calls is not None:
+                _calls.append(call)
+        for hook in list(_hooks):
+            hook(call)
+
+
+def _label(call: GitCall) -> str:
+    return " ".join(call.argv[:2]) if call.kind == "pipe" else call.argv[0]
+
+
+def summary(calls: List[GitCall], top: int = 20) -> str:
+    """Table of git time per (subcommand, call site), most expensive first."""
+    groups: Dict[tuple, List[GitCall]] = defaultdict(list)
+    for call in calls:
+        groups[(_label(call), call.caller)].append(call)
+    rows = sorted(groups.items(), key=lambda kv: -sum(c.duration for c in kv[1]))
+
+    total = sum(c.duration for c in calls)
+    lines = [
+        f"{len(calls)} git calls, {total * 1000:.1f} ms total",
+        f"{'calls':>6} {'total ms':>9} {'mean ms':>8} {'max ms':>8} {'KiB out':>8}  "
+        f"{'git':<18} caller",
+    ]
+    for (label, caller), group in rows[:top]:
+        spent = sum(c.duration for c in group)
+        flag = "  <- N+1?" if len(group) >= _NPLUS1 and not label.startswith("cat-file") else ""
+        lines.append(
+            f"{len(group):>6} {spent * 1000:>9.1f} {spent / len(group) * 1000:>8.2f} "
+            f"{max(c.duration for c in group) * 1000:>8.2f} "
+            f"{sum(c.stdout_bytes for c in group) / 1024:>8.1f}  {label:<18} {caller}{flag}"
+        )
+    if len(rows) > top:
+        lines.append(f"... {len(rows) - top} more call sites")
+    return "\n".join(lines)
+
+
+def write_chrome_trace(calls: List[GitCall], path: Path):
+    """Write ``calls`` in the Chrome trace event format (chrome://tracing, Perfetto)."""
+    origin = min((c.start for c in calls), default=0.0)
+    pid = os.getpid()
+    events = [
+        {
+            "name": " ".join(c.argv)[:120],
+            "cat": c.kind,
+            "ph": "X",
+            "ts": (c.start - origin) * 1e6,
+            "dur": c.duration * 1e6,
+            "pid": pid,
+            "tid": c.thread,
+            "args": {
+                "argv": c.argv,
+                "caller": c.caller,
+                "stdout_bytes": c.stdout_bytes,
+                "ok": c.ok,
+            },
+        }
+        for c in calls
+    ]
+    Path(path).write_text(
+        json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8"
+    )
@@ -1,26 +1,32 @@
 from __future__ import annotations
 
 import io
+import os
 import re
+import json
 import sys
-import yaml
 import argparse
 import subprocess
 
 from pathlib import Path
+from typing import Dict, List, Optional
 
+from versioning_tool import trace
 from versioning_tool.config import PYPROJECT_FILE, VERSIONING_CONFIG, PROJ_ROOT
 from versioning_tool.core import (
+    NATIVE_SCOPE,
+    Commit,
     GitRange,
+    git_session,
     current_branch,
-    changed_files,
-    commit_messages,
     filter_files,
-    filter_commits,
+    compile_commit_filter,
 )
-from versioning_tool.rules import decide_bump, next_version
-from versioning_tool.changelog import write_changelog
-from versioning_tool.graph import graph_for_main, write_graph_to_readme
+from versioning_tool.cache import commits_in_range, classify_commits
+from versioning_tool.rules import compile_bump_rules, decide_bump, next_version
+
+# changelog (jinja2) and graph are imported by the subcommands that need them so
+# that `vutil check`, which runs in pre-commit hooks, starts as fast as possible.
 
 
 def read_pyproject_version(path: Path) -> str:
@@ -55,26 +61,33 @@ def main_version_from_remote(default_branch: str) -> str:
 
 
 def load_cfg(path: Path) -> dict:
+    import yaml
+
     return yaml.safe_load(path.read_text(encoding="utf-8")) if path.exists() else {}
 
 
-def compute_decision(cfg: dict, base_branch: str, head: str) -> tuple[str, str, str]:
+def decide_from_commits(
+    cfg: dict,
+    branch: str,
+    current_ver: str,
+    commits: List[Commit],
+    files: Optional[List[str]] = None,
+    levels: Optional[Dict[str, Optional[str]]] = None,
+) -> tuple[str, str, str]:
     """
-    Returns (suggested_version, reason, detected_bump)
+    Returns (suggested_version, reason, detected_bump) for an already collected
+    list of commits; ``files`` defaults to every file those commits touched and
+    ``levels`` may hold bump levels already classified per SHA.
     """
-    branch = current_branch()
-    current_ver = read_pyproject_version(PYPROJECT_FILE)
-
-    # Choose comparison base for change detection
-    base = f"origin/{base_branch}"
-    gr = GitRange(base=base, head=head)
-
-    files = changed_files(gr)
-    msgs = commit_messages(gr)
+    commits = [c for c in commits if c.subject.strip()]
+    if files is None:
+        files = list(dict.fromkeys(f for c in commits for f in c.files))
 
     # filters
     files_kept = filter_files(files, cfg.get("ignore", {}).get("files", []))
-    msgs_kept = filter_commits(msgs, cfg.get("ignore", {}).get("commits", []))
+    commit_filter = compile_commit_filter(tuple(cfg.get("ignore", {}).get("commits", [])))
+    commits_kept = [c for c in commits if commit_filter.match(c.subject) is None]
+    msgs_kept = [c.rule_text for c in commits_kept]
 
     # If *only* ignored files changed, force no bump unless branch enforces prerelease
     if files_kept == [] and msgs_kept == []:
@@ -90,7 +103,12 @@ def compute_decision(cfg: dict, base_branch: str, head: str) -> tuple[str, str,
                 decision.bump or ("prerelease" if decision.prerelease else "patch"),
             )
 
-    decision = decide_bump(branch, msgs_kept, cfg, current_version=current_ver)
+    rules = compile_bump_rules(cfg.get("conventional_bump", {}))
+    if levels is None:
+        kept_levels = classify_commits(commits_kept, rules)
+    else:
+        kept_levels = [levels[c.sha] for c in commits_kept]
+    decision = decide_bump(branch, msgs_kept, cfg, current_version=current_ver, levels=kept_levels)
     suggested = next_version(current_ver, decision)
     return (
         suggested,
@@ -99,18 +117,110 @@ def compute_decision(cfg: dict, base_branch: str, head: str) -> tuple[str, str,
     )
 
 
-def cmd_check(args):
-    cfg = load_cfg(VERSIONING_CONFIG)
+def compute_decision(cfg: dict, base_branch: str, head: str) -> tuple[str, str, str]:
+    """
+    Returns (suggested_version, reason, detected_bump)
+    """
+    branch = current_branch()
+    current_ver = read_pyproject_version(PYPROJECT_FILE)
+
+    # Choose comparison base for change detection
+    base = f"origin/{base_branch}"
+    gr = GitRange(base=base, head=head)
+
+    # One history walk (served from the commit cache where possible) feeds
+    # both the file filter and the bump rules
+    return decide_from_commits(cfg, branch, current_ver, commits_in_range(gr))
+
+
+def check_report(cfg: dict) -> str:
     base = cfg.get("default_branch", "main")
     suggested, reason, bump = compute_decision(cfg, base, "HEAD")
     current_ver = read_pyproject_version(PYPROJECT_FILE)
-    print(f"Branch: {current_branch()}")
-    print(f"Current: {current_ver}")
-    print(f"Suggested: {suggested}  ({bump})")
-    print(f"Reason: {reason}")
+    return "\n".join(
+        [
+            f"Branch: {current_branch()}",
+            f"Current: {current_ver}",
+            f"Suggested: {suggested}  ({bump})",
+            f"Reason: {reason}",
+        ]
+    )
+
+
+def suggest_version(cfg: dict) -> str:
+    return compute_decision(cfg, cfg.get("default_branch", "main"), "HEAD")[0]
+
+
+def release_notes(cfg: dict) -> str:
+    from versioning_tool.changelog import generate_release_notes
+
+    return generate_release_notes(suggest_version(cfg), cfg, PROJ_ROOT)
+
+
+# Read-only queries a running `vutil daemon` can answer
+QUERIES = {"check": check_report, "suggest": suggest_version, "notes": release_notes}
+
+
+def run_query(name: str) -> str:
+    """Answer ``name`` from the daemon when one is running, in-process otherwise."""
+    from versioning_tool.daemon import request
+
+    out = request(name)
+    if out is None:
+        out = QUERIES[name](load_cfg(VERSIONING_CONFIG))
+    return out
+
+
+def cmd_check(args):
+    print(run_query("check"))
+
+
+def cmd_suggest(args):
+    print(run_query("suggest"))
+
+
+def cmd_notes(args):
+    print(run_query("notes"))
+
+
+def cmd_monorepo(args):
+    from versioning_tool.monorepo import plan_packages
+
+    cfg = load_cfg(VERSIONING_CONFIG)
+    base = args.base or f"origin/{cfg.get('default_branch', 'main')}"
+    plan = json.dumps(plan_packages(cfg, base, args.head), indent=2)
+    if args.output:
+        Path(args.output).write_text(plan + "\n", encoding="utf-8")
+    else:
+        print(plan)
+
+
+def cmd_plan(args):
+    from versioning_tool.plan import plan_branches
+
+    cfg = load_cfg(VERSIONING_CONFIG)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for row in plan_branches(cfg, args.branches or ["*"], args.base):
+            out.write(json.dumps(row) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def cmd_daemon(args):
+    from versioning_tool.daemon import serve, stop
+
+    if args.stop:
+        print("Daemon stopped." if stop() else "No daemon running.")
+        return
+    serve()
 
 
 def cmd_bump(args):
+    from versioning_tool.changelog import write_changelog
+
     cfg = load_cfg(VERSIONING_CONFIG)
     base = cfg.get("default_branch", "main")
     suggested, reason, bump = compute_decision(cfg, base, "HEAD")
@@ -141,6 +251,8 @@ def cmd_bump(args):
 
 
 def cmd_changelog(args):
+    from versioning_tool.changelog import rebuild_changelog, write_changelog
+
     cfg = load_cfg(VERSIONING_CONFIG)
     base = cfg.get("default_branch", "main")
     # Use current pyproject version to emit an entry (main only)
@@ -148,11 +260,17 @@ def cmd_changelog(args):
     if current_branch() != base:
         print("Changelog generation is main-only (per config). Skipped.")
         return
-    write_changelog(ver, cfg, PROJ_ROOT)
+    if args.rebuild:
+        n = rebuild_changelog(cfg, PROJ_ROOT, jobs=args.jobs)
+        print(f"Changelog rebuilt ({n} releases).")
+        return
+    write_changelog(ver, cfg, PROJ_ROOT, incremental=args.incremental or None)
     print("Changelog updated.")
 
 
 def cmd_graph(args):
+    from versioning_tool.graph import graph_for_main, write_graph_to_readme
+
     cfg = load_cfg(VERSIONING_CONFIG)
     base = cfg.get("default_branch", "main")
     gcfg = cfg.get("graph", {})
@@ -160,7 +278,7 @@ def cmd_graph(args):
     # Get graph type from args or config
     graph_type = getattr(args, "type", gcfg.get("type", "release"))
 
-    g = graph_for_main(base, gcfg.get("max_tags", 12), graph_type)
+    g = graph_for_main(base, gcfg.get("max_tags", 12), graph_type, gcfg.get("max_branches"))
     write_graph_to_readme(
         PROJ_ROOT / gcfg.get("readme_file", "README.md"),
         gcfg.get("start_after_heading", "Release Graph"),
@@ -173,31 +291,103 @@ def main():
     p = argparse.ArgumentParser(
         prog="version-manager", description="Versioning and changelog manager"
     )
+    p.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a table of the git calls the command made (bypasses the daemon)",
+    )
+    p.add_argument(
+        "--trace",
+        metavar="FILE",
+        type=Path,
+        help="Write the git calls as a Chrome trace (chrome://tracing, Perfetto)",
+    )
     sub = p.add_subparsers(dest="command", required=True)
 
     sub.add_parser("check", help="Show suggested version bump and reason").set_defaults(
         func=cmd_check
     )
 
+    sub.add_parser("suggest", help="Print only the suggested next version").set_defaults(
+        func=cmd_suggest
+    )
+
+    sub.add_parser("notes", help="Print release notes for the suggested version").set_defaults(
+        func=cmd_notes
+    )
+
+    m = sub.add_parser("monorepo", help="Plan per-package bumps for every package in the repo")
+    m.add_argument("--base", help="Base revision (default: origin/<default_branch>)")
+    m.add_argument("--head", default="HEAD", help="Head revision (default: HEAD)")
+    m.add_argument("-o", "--output", help="Write the JSON plan to this file")
+    m.set_defaults(func=cmd_monorepo)
+
+    pl = sub.add_parser("plan", help="Plan bumps for many branches at once (JSON lines)")
+    pl.add_argument(
+        "--branches",
+        action="append",
+        metavar="GLOB",
+        help="Branch name pattern, e.g. 'feature/*' (repeatable; default: all branches)",
+    )
+    pl.add_argument("--base", help="Base revision (default: origin/<default_branch>)")
+    pl.add_argument("-o", "--output", help="Write the JSON lines to this file")
+    pl.set_defaults(func=cmd_plan)
+
+    d = sub.add_parser("daemon", help="Serve check/suggest/notes from a warm background process")
+    d.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    d.set_defaults(func=cmd_daemon)
+
     b = sub.add_parser("bump", help="Apply suggested bump (writes pyproject.toml)")
     b.add_argument("-y", "--yes", action="store_true", help="Non-interactive")
     b.set_defaults(func=cmd_bump)
 
-    sub.add_parser(
-        "changelog", help="Regenerate changelog for current version on main"
-    ).set_defaults(func=cmd_changelog)
+    c = sub.add_parser("changelog", help="Regenerate changelog for current version on main")
+    c.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process commits since the last run and patch the current release section",
+    )
+    c.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Regenerate the whole changelog from every tag on the default branch",
+    )
+    c.add_argument("-j", "--jobs", type=int, help="Worker processes for --rebuild")
+    c.set_defaults(func=cmd_changelog)
 
     g = sub.add_parser("graph", help="Regenerate Mermaid gitGraph section in README")
     g.add_argument(
         "--type",
-        choices=["release", "simple", "detailed"],
+        choices=["release", "simple", "detailed", "branch", "commit"],
         default="release",
         help="Type of graph to generate",
     )
     g.set_defaults(func=cmd_graph)
 
     args = p.parse_args()
-    args.func(args)
+    profiling = args.profile or args.trace
+    if profiling:
+        os.environ["VUTIL_NO_DAEMON"] = "1"  # the calls must happen in this process
+        trace.start()
+    try:
+        # One git session (cat-file pipes + memoized queries) per command
+        with git_session():
+            args.func(args)
+    except FileNotFoundError as e:
+        if e.filename != "git":
+            raise
+        # get_backend reads .git without git, but history walks still start it
+        sys.exit(
+            f"vutil: git not found on PATH. `vutil {args.command}` needs git; without it "
+            f"the native backend only answers lookups ({NATIVE_SCOPE})."
+        )
+    finally:
+        if profiling:
+            calls = trace.stop()
+            if args.profile:
+                print(trace.summary(calls), file=sys.stderr)
+            if args.trace:
+                trace.write_chrome_trace(calls, args.trace)
 
 
 if __name__ == "__main__":